@@ -0,0 +1,92 @@
+"""
+Viewport-aware sampling of y = a(x - h)^2 + k.
+
+Instead of evaluating a fixed grid, `sample_parabola` solves for the parts of
+the curve that lie inside the visible y-range, and samples only those. Inside
+them it places points by equal turning of the tangent (measured in pixels),
+so they are dense around the vertex where the curvature is high and sparse on
+the nearly straight arms. A maximum on-screen step keeps the long arms smooth.
+"""
+import numpy as np
+
+MAX_TURN = np.deg2rad(2.0)  # tangent turning per segment
+MAX_STEP = 40.0             # longest segment, in pixels
+
+
+def visible_intervals(a, h, k, xlim, ylim=None):
+    """x-intervals of `xlim` in which the curve lies inside `ylim` (at most two: one per arm)."""
+    x0, x1 = sorted(xlim)
+    if ylim is None:
+        return [(x0, x1)]
+    y0, y1 = sorted(ylim)
+    if a == 0:
+        return [(x0, x1)] if y0 <= k <= y1 else []
+
+    # |x - h| must stay below the far y-limit and above the near one (the one the vertex faces)
+    y_far, y_near = (y1, y0) if a > 0 else (y0, y1)
+    outer = (y_far - k) / a
+    if outer < 0:
+        return []
+    inner = (y_near - k) / a
+    r_out = np.sqrt(outer)
+    r_in = np.sqrt(inner) if inner > 0 else 0.0
+
+    if r_in == 0.0:
+        candidates = [(h - r_out, h + r_out)]
+    else:
+        candidates = [(h - r_out, h - r_in), (h + r_in, h + r_out)]
+    return [(max(lo, x0), min(hi, x1)) for lo, hi in candidates if min(hi, x1) > max(lo, x0)]
+
+
+def _sample_interval(a, h, lo, hi, sx, sy, max_turn, max_step):
+    if a == 0:
+        u = np.array([lo, hi])
+    else:
+        # Slope on screen is c * (x - h); uniform steps of the tangent angle
+        c = 2 * a * sy / sx
+        t0, t1 = np.arctan(c * (lo - h)), np.arctan(c * (hi - h))
+        n = max(int(np.ceil(abs(t1 - t0) / max_turn)), 1)
+        u = h + np.tan(np.linspace(t0, t1, n + 1)) / c
+        u[0], u[-1] = lo, hi
+
+    # Split segments that are still longer than max_step pixels
+    y = a * (u - h)**2
+    length = np.hypot(np.diff(u) * sx, np.diff(y) * sy)
+    pieces = np.maximum(np.ceil(length / max_step), 1).astype(int)
+    if (pieces > 1).any():
+        starts = np.repeat(u[:-1], pieces)
+        widths = np.repeat(np.diff(u) / pieces, pieces)
+        offsets = np.arange(pieces.sum()) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+        u = np.append(starts + offsets * widths, u[-1])
+    return u
+
+
+def sample_parabola(a, h, k, xlim, ylim=None, scale=None, max_turn=MAX_TURN, max_step=MAX_STEP):
+    """
+    Samples the visible part of y = a(x - h)^2 + k and returns (x, y).
+
+    `scale` is (pixels per x unit, pixels per y unit); by default the x-range
+    is taken to span 1000 pixels with equal scaling. When both arms are visible
+    without the vertex, they are joined by a NaN so they draw as two pieces.
+    """
+    if scale is None:
+        sx = 1000.0 / (abs(xlim[1] - xlim[0]) or 1.0)
+        scale = (sx, sx)
+    sx, sy = abs(scale[0]), abs(scale[1])
+
+    parts = []
+    for lo, hi in visible_intervals(a, h, k, xlim, ylim):
+        if parts:
+            parts.append(np.array([np.nan]))
+        parts.append(_sample_interval(a, h, lo, hi, sx, sy, max_turn, max_step))
+    if not parts:
+        return np.empty(0), np.empty(0)
+
+    x = np.concatenate(parts)
+    return x, a * (x - h)**2 + k
+
+
+def axes_scale(ax):
+    """Pixels per data unit along x and y for a linear axes."""
+    (x0, y0), (x1, y1) = ax.transData.transform([(0, 0), (1, 1)])
+    return x1 - x0, y1 - y0
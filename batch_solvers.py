@@ -0,0 +1,71 @@
+"""
+Vectorized solvers for the dependent points of the interactive figures.
+
+Each function takes an array of driver parameters (or a single value) and
+returns (N, 2) arrays of points (or (2,) points) in one pass:
+
+    rotation_e        <-> InteractiveRotation.calculate_e        (t002.py)
+    problem3_points   <-> InteractiveProblem3.update_dependent_points (t003-3.py)
+    geometry_positions <-> InteractiveGeometry.calculate_positions (t004.py)
+
+The constructions are written with the homogeneous-coordinate primitives of
+`homogeneous`, so vertical and horizontal lines need no special cases and
+degenerate configurations (parallel lines) give inf/nan points instead of
+exceptions or 1e9 stand-ins.
+"""
+
+import numpy as np
+
+import homogeneous as hg
+
+
+def _points(x, y):
+    return np.stack(np.broadcast_arrays(x, y), axis=-1)
+
+
+def _lift(xy):
+    # A fixed point (2,) or one point per configuration (N, 2)
+    xy = np.asarray(xy, dtype=float)
+    return hg.point(xy[..., 0], xy[..., 1])
+
+
+def rotation_e(p_x, C=(2, 2)):
+    """E for P = (p_x, 0): P rotated 90 degrees counter-clockwise around C."""
+    p_x = np.asarray(p_x, dtype=float)
+    cx, cy = C
+    # CP = (p_x - cx, -cy) -> CE = (cy, p_x - cx)
+    return _points(cx + cy, cy + p_x - cx)
+
+
+def problem3_points(p_x, A=(0, 3), B=(-2, 0), C=(1, -2), D=(3, 0)):
+    """Q, F and F' for P = (p_x, 0); the fixed points may also be (N, 2) arrays."""
+    P = hg.point(np.asarray(p_x, dtype=float), 0.0)
+    A, B, C, D = (_lift(xy) for xy in (A, B, C, D))
+
+    # 1. Q: perpendicular to AP through P, on line CD
+    Q = hg.meet(hg.perpendicular(hg.join(A, P), P), hg.join(C, D))
+
+    # 2. F: BF at 45 degrees to BQ, on the extension of DA (x_f < 0)
+    line_da = hg.join(D, A)
+    bq = hg.direction(B, Q)
+    f1 = hg.meet(hg.join(B, hg.turn(bq, -45)), line_da)
+    f2 = hg.meet(hg.join(B, hg.turn(bq, 45)), line_da)
+    F = hg.select(hg.is_left(f1), f1, f2)
+
+    # 3. F': F rotated -90 degrees around B
+    F_prime = hg.rotate(F, B[:2], -90)
+
+    return hg.cartesian(Q), hg.cartesian(F), hg.cartesian(F_prime)
+
+
+def geometry_positions(e_y, A=(0, 4), B=(4, 0), O=(0, 0)):
+    """E, C and D for E = (0, e_y), with AC perpendicular to BE; the fixed points may also be (N, 2) arrays."""
+    E = hg.point(0.0, np.asarray(e_y, dtype=float))
+    A, B, O = (_lift(xy) for xy in (A, B, O))
+
+    line_be = hg.join(B, E)
+    line_ac = hg.perpendicular(line_be, A)
+    C = hg.meet(line_ac, hg.join(O, B))
+    D = hg.meet(line_ac, line_be)
+
+    return hg.cartesian(E), hg.cartesian(C), hg.cartesian(D)
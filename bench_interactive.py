@@ -0,0 +1,264 @@
+"""
+Per-frame latency benchmark for the interactive figures.
+
+Each figure is built on the Agg backend and driven by synthetic mouse events:
+a press on the draggable point, a stream of motion events along the driver's
+domain, and a release. The parabola sliders are driven through set_val. For
+every event the benchmark records the event-to-pixels latency (dispatch until
+the frame is in the Agg buffer), split into geometry and rendering; every
+draw an event triggers counts as rendering. The timing pass is repeated and
+each statistic is the median over the repeats. A separate pass counts, per
+event, the memory blocks allocated during the event that are still held when
+it ends (replaced buffers count, temporaries freed within the event do not)
+and the peak of the memory allocated during the event.
+
+    python bench_interactive.py                          # print a report
+    python bench_interactive.py --save bench/baseline.json
+    python bench_interactive.py --compare bench/baseline.json --tolerance 0.25
+
+--compare exits with status 1 if any p50/p95/p99 regressed by more than the
+tolerance (relative) and --min-delta (absolute, in ms), or if the blocks
+allocated per event grew by more than the tolerance and --min-blocks.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+from matplotlib.backend_bases import MouseEvent
+
+from problems import load_problem
+
+# problem -> (class, draggable artist, data position of the driver value, driver values)
+DRAG_SPECS = {
+    't001-2': ('InteractiveExistence', 'point_m_plot', lambda m: (m, 0), (6.0, 12.0, 4.5)),
+    't002': ('InteractiveRotation', 'point_p', lambda x: (x, 0), (-2.0, -10.0, 5.0)),
+    't003-3': ('InteractiveProblem3', 'point_p', lambda x: (x, 0), (5.0, 12.0, 3.5)),
+    't004': ('InteractiveGeometry', 'point_E', lambda y: (0, y), (2.0, 0.1, 3.9)),
+}
+# problem -> (class, slider, slider values)
+SLIDER_SPECS = {
+    'plot_parabola': ('InteractiveParabola', 'slider_a', (1.0, -5.0, 5.0)),
+}
+BENCHMARKS = list(DRAG_SPECS) + list(SLIDER_SPECS)
+PERCENTILES = (50, 95, 99)
+
+
+def _path(waypoints, n):
+    """n values going through the waypoints piecewise linearly."""
+    t = np.linspace(0, len(waypoints) - 1, n)
+    return np.interp(t, np.arange(len(waypoints)), waypoints)
+
+
+def _mouse(canvas, ax, name, xy):
+    x, y = ax.transData.transform(xy)
+    return MouseEvent(name, canvas, x, y, button=1)
+
+
+def _timed(func, sink):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sink.append(time.perf_counter() - start)
+    return wrapper
+
+
+class Driver:
+    """Builds one figure headlessly and replays events against it."""
+
+    def __init__(self, name):
+        self.name = name
+        module = load_problem(name)
+        if name in DRAG_SPECS:
+            cls, artist, self.to_xy, self.waypoints = DRAG_SPECS[name]
+            self.plot = getattr(module, cls)(fps=None)
+            self.artist = getattr(self.plot, artist)
+        else:
+            cls, slider, self.waypoints = SLIDER_SPECS[name]
+            self.plot = getattr(module, cls)()
+            self.slider = getattr(self.plot, slider)
+        self.fig = self.plot.fig
+        self.canvas = self.fig.canvas
+        self.canvas.draw()
+
+        # Time the rendering part of every event
+        self.render_times = []
+        if hasattr(self.plot, 'blitter'):
+            self.plot.blitter.update = _timed(self.plot.blitter.update, self.render_times)
+        else:
+            self.canvas.draw_idle = _timed(self.canvas.draw_idle, self.render_times)
+
+    def events(self, n):
+        """Yields one callable per event; calling it dispatches the event synchronously."""
+        values = _path(self.waypoints, n)
+        if hasattr(self, 'slider'):
+            for value in values:
+                yield lambda value=value: self.slider.set_val(value)
+            return
+
+        ax = self.artist.axes
+        process = self.canvas.callbacks.process
+        xy = self.artist.get_xydata()[0]
+        process('button_press_event', _mouse(self.canvas, ax, 'button_press_event', xy))
+        for value in values:
+            event = _mouse(self.canvas, ax, 'motion_notify_event', self.to_xy(value))
+            yield lambda event=event: process('motion_notify_event', event)
+        process('button_release_event', _mouse(self.canvas, ax, 'button_release_event', self.to_xy(values[-1])))
+
+
+def _stats(seconds):
+    ms = np.asarray(seconds) * 1000
+    if ms.size == 0:
+        return {f'p{p}': 0.0 for p in PERCENTILES} | {'mean': 0.0}
+    result = {f'p{p}': float(np.percentile(ms, p)) for p in PERCENTILES}
+    result['mean'] = float(ms.mean())
+    return result
+
+
+def _median_stats(per_run):
+    """Each statistic's median over several _stats results."""
+    return {key: float(np.median([stats[key] for stats in per_run])) for key in per_run[0]}
+
+
+def _timing_pass(driver, events):
+    """Returns (total, geometry, render) seconds per event."""
+    totals, geometry, render = [], [], []
+    for dispatch in driver.events(events):
+        mark = len(driver.render_times)
+        start = time.perf_counter()
+        dispatch()
+        total = time.perf_counter() - start
+        # A slider event draws twice (set_val and the figure's update); both are rendering
+        drawn = sum(driver.render_times[mark:])
+        totals.append(total)
+        geometry.append(total - drawn)
+        render.append(drawn)
+    return totals, geometry, render
+
+
+def _allocation_pass(driver, events):
+    """Returns (blocks, peak bytes) allocated per event; only this event's allocations are traced."""
+    blocks, peaks = [], []
+    tracemalloc.start()
+    try:
+        for dispatch in driver.events(events):
+            tracemalloc.clear_traces()
+            dispatch()
+            blocks.append(sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename')))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    return blocks, peaks
+
+
+def run_benchmark(name, events=300, warmup=20, repeats=3):
+    """Measures one figure; returns a dict of latency statistics in milliseconds."""
+    driver = Driver(name)
+    for dispatch in driver.events(warmup):
+        dispatch()
+
+    # Timing passes; each statistic is the median over the repeats
+    runs = [[_stats(times) for times in _timing_pass(driver, events)] for _ in range(repeats)]
+    latency, geometry, render = (_median_stats(per_run) for per_run in zip(*runs))
+
+    # Allocation pass (tracing slows everything down, so it is kept separate)
+    blocks, peaks = _allocation_pass(driver, events)
+
+    import matplotlib.pyplot as plt
+    plt.close(driver.fig)
+    return {
+        'events': events,
+        'repeats': repeats,
+        'latency_ms': latency,
+        'geometry_ms': geometry,
+        'render_ms': render,
+        'alloc_blocks_per_event': float(np.median(blocks)),
+        'alloc_peak_kib_per_event': float(np.median(peaks)) / 1024,
+    }
+
+
+def run_all(names, events=300, warmup=20, repeats=3):
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'matplotlib': matplotlib.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'events': events,
+            'repeats': repeats,
+        },
+        'results': {name: run_benchmark(name, events, warmup, repeats) for name in names},
+    }
+
+
+def compare(current, baseline, tolerance=0.25, min_delta=0.5, min_blocks=5):
+    """Lists the latency percentiles and allocation counts that regressed against the baseline."""
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        for metric in ('latency_ms', 'geometry_ms', 'render_ms'):
+            for key in (f'p{p}' for p in PERCENTILES):
+                old, new = base[metric][key], result[metric][key]
+                if new > old * (1 + tolerance) and new - old > min_delta:
+                    regressions.append(f'{name} {metric} {key}: {old:.3f} -> {new:.3f} ms')
+        old, new = base.get('alloc_blocks_per_event'), result['alloc_blocks_per_event']
+        if old is not None and new > old * (1 + tolerance) and new - old > min_blocks:
+            regressions.append(f'{name} alloc_blocks_per_event: {old:.0f} -> {new:.0f}')
+    return regressions
+
+
+def format_report(report):
+    lines = [f"{'figure':<15}{'p50':>9}{'p95':>9}{'p99':>9}{'geom p50':>10}{'draw p50':>10}{'blocks/ev':>11}{'KiB/ev':>9}"]
+    for name, r in report['results'].items():
+        lat = r['latency_ms']
+        lines.append(f"{name:<15}{lat['p50']:>9.3f}{lat['p95']:>9.3f}{lat['p99']:>9.3f}"
+                     f"{r['geometry_ms']['p50']:>10.3f}{r['render_ms']['p50']:>10.3f}"
+                     f"{r['alloc_blocks_per_event']:>11.0f}{r['alloc_peak_kib_per_event']:>9.1f}")
+    return '\n'.join(lines) + '\n(latencies in ms, event dispatch to pixels in the Agg buffer)'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark per-event latency of the interactive figures.')
+    parser.add_argument('figures', nargs='*', metavar='figure', help=f"default: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--events', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--repeats', type=int, default=3, help='timing passes per figure; the median is kept (default 3)')
+    parser.add_argument('--save', metavar='JSON', help='write the results as a baseline')
+    parser.add_argument('--compare', metavar='JSON', help='fail if slower than this baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown (default 0.25)')
+    parser.add_argument('--min-delta', type=float, default=0.5, help='ignore slowdowns below this many ms (default 0.5)')
+    parser.add_argument('--min-blocks', type=float, default=5, help='ignore allocation growth below this many blocks per event')
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.figures if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown figure(s): {', '.join(unknown)}")
+
+    report = run_all(args.figures or BENCHMARKS, args.events, args.warmup, args.repeats)
+    print(format_report(report))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.min_delta, args.min_blocks)
+        for line in regressions:
+            print('REGRESSION', line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+class BlitManager:
+    """
+    Redraws only the moving artists of a figure on top of a cached background.
+
+    The static part of the figure (grid, axes, legend, fixed points and lines)
+    is rendered once and copied on every full draw. `update()` then restores
+    that copy and draws the animated artists over it, instead of asking the
+    canvas for a complete redraw.
+
+    With a FrameCache, `update(key)` also remembers the finished frame under
+    `key` and the current view, and shows a remembered frame directly on a hit.
+    """
+
+    def __init__(self, canvas, animated_artists=(), enabled=True, cache=None):
+        self.canvas = canvas
+        self.enabled = enabled and getattr(canvas, 'supports_blit', False)
+        self.cache = cache
+        self._background = None
+        self._view = None
+        self._artists = []
+
+        for artist in animated_artists:
+            self.add_artist(artist)
+
+        if self.enabled:
+            self.cid = canvas.mpl_connect('draw_event', self.on_draw)
+
+    def add_artist(self, artist):
+        """Registers an artist that changes between frames."""
+        if self.enabled:
+            artist.set_animated(True)
+        self._artists.append(artist)
+        # Keep the original stacking order (e.g. zorder=0 polygons stay below the lines)
+        self._artists.sort(key=lambda a: a.get_zorder())
+
+    def remove_artist(self, artist):
+        if artist in self._artists:
+            self._artists.remove(artist)
+            artist.set_animated(False)
+
+    def on_draw(self, event):
+        """Caches the freshly drawn background after every full draw (show, resize, zoom)."""
+        canvas = self.canvas
+        # savefig draws too (possibly on a temporary vector canvas); only screen draws give a background
+        if event is not None and event.canvas is not canvas or canvas.is_saving():
+            return
+        self._background = canvas.copy_from_bbox(canvas.figure.bbox)
+        self._view = self._view_key()
+        if self.cache is not None:
+            # Frames rendered over the old background are stale, even at the same view
+            self.cache.clear()
+        self._draw_animated()
+
+    def _view_key(self):
+        figure = self.canvas.figure
+        return (figure.bbox.bounds, tuple(ax.viewLim.bounds for ax in figure.axes))
+
+    def _draw_animated(self):
+        figure = self.canvas.figure
+        for artist in self._artists:
+            figure.draw_artist(artist)
+
+    def update(self, key=None):
+        """Pushes the current state of the animated artists to the screen; `key` names the frame for the cache."""
+        if not self.enabled or self._background is None:
+            # No background yet (figure not shown) or no blitting: fall back to a full redraw
+            self.canvas.draw_idle()
+            return
+        canvas = self.canvas
+        bbox = canvas.figure.bbox
+        frame = None
+        if self.cache is not None and key is not None:
+            key = (key, self._view)
+            frame = self.cache.get(key)
+        if frame is not None:
+            canvas.restore_region(frame)
+        else:
+            canvas.restore_region(self._background)
+            self._draw_animated()
+            if self.cache is not None and key is not None:
+                self.cache.put(key, canvas.copy_from_bbox(bbox), 4 * int(bbox.width) * int(bbox.height))
+        canvas.blit(bbox)
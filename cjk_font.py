@@ -0,0 +1,84 @@
+"""
+Chinese (CJK) font selection shared by the scripts.
+
+The chosen font is written to a small JSON file in matplotlib's cache
+directory. The entry is keyed by matplotlib's own font list cache (path,
+size and modification time), so it is dropped as soon as matplotlib rebuilds
+that list, e.g. after fonts are installed or removed. Repeat launches read the
+answer back instead of searching the installed fonts.
+
+Nothing here changes the global rcParams: `chinese_font_rc()` returns the
+settings, and a script applies them only around the construction of its own
+figure, e.g. by decorating it with `@matplotlib.rc_context(CJK_RC)`. Texts
+keep the font family they were created with, so other figures in the same
+process (render workers, the launcher) are unaffected.
+"""
+import json
+import os
+
+import matplotlib
+
+FONT_NAMES = ['Heiti TC', 'Arial Unicode MS', 'STHeiti', 'SimHei',
+              'PingFang SC', 'Microsoft YaHei', 'Noto Sans CJK SC', 'WenQuanYi Zen Hei']
+
+CACHE_FILE = os.path.join(matplotlib.get_cachedir(), 'math-project-cjk-font.json')
+
+
+def _font_list_fingerprint():
+    """Identifies the current matplotlib font list without scanning any fonts."""
+    from matplotlib import font_manager as fm
+
+    path = os.path.join(matplotlib.get_cachedir(), f'fontlist-v{fm.FontManager.__version__}.json')
+    try:
+        st = os.stat(path)
+    except OSError:
+        # No font list cache on disk: fall back to the (in-memory) list itself
+        return f'{matplotlib.__version__}:{len(fm.fontManager.ttflist)}'
+    return f'{matplotlib.__version__}:{path}:{st.st_size}:{st.st_mtime_ns}'
+
+
+def _read_cache():
+    try:
+        with open(CACHE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(cache):
+    try:
+        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError:
+        pass  # Read-only cache directory: resolve again next time
+
+
+def find_chinese_font(font_names=FONT_NAMES):
+    """Returns the first installed font of `font_names`, or None. The answer is cached on disk."""
+    key = '|'.join(font_names)
+    fingerprint = _font_list_fingerprint()
+    cache = _read_cache()
+    entry = cache.get(key)
+    if entry is not None and entry.get('fingerprint') == fingerprint:
+        return entry['font']
+
+    from matplotlib import font_manager as fm
+
+    installed = {font.name for font in fm.fontManager.ttflist}
+    found_font = next((name for name in font_names if name in installed), None)
+    cache[key] = {'fingerprint': fingerprint, 'font': found_font}
+    _write_cache(cache)
+    return found_font
+
+
+def chinese_font_rc(font_names=FONT_NAMES):
+    """
+    自动查找可用的中文字体, 返回用于 matplotlib.rc_context 的设置 (找不到时为空)。
+    字体排在默认字体之前; 中文字体缺少的字形 (如负号) 由后面的字体补上。
+    """
+    found_font = find_chinese_font(font_names)
+    if not found_font:
+        print("警告: 未找到指定的中文字体。图例和标题可能显示为方框。")
+        return {}
+    print(f"找到可用中文字体: {found_font}")
+    return {'font.family': [found_font] + list(matplotlib.rcParams['font.family'])}
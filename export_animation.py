@@ -0,0 +1,228 @@
+"""
+Streams parameter sweeps of the interactive figures into GIF or animated PNG clips.
+
+    python export_animation.py t002                          # clips/t002.gif, P along its sweep
+    python export_animation.py t004 t001-2 --frames 240 --fps 30 --format apng
+    python export_animation.py t003-3 --range 4 8 --jobs 4 --dpi 120
+
+The figure is built once and driven through its own update method (the one
+the mouse drag calls). Every frame is rasterized with Agg, encoded with Pillow
+and appended to the file right away, so memory use does not grow with the
+length of the clip. Pillow's own multi-frame writers keep every frame until
+the end, so only the per-frame encoding is left to Pillow here; the GIF/APNG
+container is written by this module.
+
+With --jobs N, frames are rendered and encoded by N worker processes; at most
+2N encoded frames are waiting to be written at any time.
+"""
+import argparse
+import io
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from problems import PROBLEMS, load_problem
+
+# Problem -> (figure class, method moving the driver point); the driver range comes from problems.SWEEPS
+ANIMATIONS = {
+    't001-2': ('InteractiveExistence', 'update_geometry'),
+    't002': ('InteractiveRotation', 'update_plot'),
+    't003-3': ('InteractiveProblem3', 'update_plot'),
+    't004': ('InteractiveGeometry', 'update_plot'),
+}
+FORMATS = {'gif': '.gif', 'apng': '.png'}
+
+
+# --- Frames ---
+
+class FrameSource:
+    """One headless figure that renders RGBA frames for driver values."""
+
+    def __init__(self, name, dpi=80):
+        import matplotlib
+        matplotlib.use('Agg')
+        cls, method = ANIMATIONS[name]
+        self.plot = getattr(load_problem(name), cls)(blit=False, fps=None)
+        self.plot.fig.set_dpi(dpi)
+        self.update = getattr(self.plot, method)
+        self.canvas = self.plot.fig.canvas
+
+    @property
+    def size(self):
+        return self.canvas.get_width_height(physical=True)
+
+    def render(self, value):
+        """Moves the driver to `value` and returns the frame as a PIL RGBA image."""
+        from PIL import Image
+        self.update(value)
+        self.canvas.draw()
+        return Image.fromarray(np.asarray(self.canvas.buffer_rgba()).copy(), 'RGBA')
+
+    def close(self):
+        import matplotlib.pyplot as plt
+        plt.close(self.plot.fig)
+
+
+def encode_gif_frame(image, duration):
+    """Image data block of one GIF frame with its own colour table and delay (ms)."""
+    from PIL import GifImagePlugin
+    frame = image.convert('RGB').quantize(256)
+    return b''.join(GifImagePlugin.getdata(frame, duration=duration, include_color_table=True))
+
+
+def encode_png_frame(image, compress_level=6):
+    """zlib stream of one RGBA frame, as Pillow's PNG encoder filters and compresses it."""
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', compress_level=compress_level)
+    data, pos = buffer.getvalue(), 8
+    chunks = []
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        if kind == b'IDAT':
+            chunks.append(data[pos + 8:pos + 8 + length])
+        pos += 12 + length
+    return b''.join(chunks)
+
+
+# --- Containers ---
+
+class GifWriter:
+    def __init__(self, fp, size, frames, duration, loop=0):
+        self.fp = fp
+        self.duration = duration
+        width, height = size
+        # Header, logical screen without a global colour table, NETSCAPE looping extension
+        fp.write(b'GIF89a' + struct.pack('<HHBBB', width, height, 0, 0, 0))
+        fp.write(b'!\xff\x0bNETSCAPE2.0\x03\x01' + struct.pack('<H', loop) + b'\x00')
+
+    def encode(self, image):
+        return encode_gif_frame(image, self.duration)
+
+    def write(self, payload):
+        self.fp.write(payload)
+
+    def close(self):
+        self.fp.write(b';')
+
+
+class ApngWriter:
+    def __init__(self, fp, size, frames, duration, loop=0):
+        self.fp = fp
+        self.size = size
+        self.duration = duration
+        self.sequence = 0
+        self.frame = 0
+        fp.write(b'\x89PNG\r\n\x1a\n')
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', size[0], size[1], 8, 6, 0, 0, 0))
+        self._chunk(b'acTL', struct.pack('>II', frames, loop))
+
+    def _chunk(self, kind, data):
+        self.fp.write(struct.pack('>I', len(data)) + kind + data)
+        self.fp.write(struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+    def _next_sequence(self):
+        self.sequence += 1
+        return self.sequence - 1
+
+    def encode(self, image):
+        return encode_png_frame(image)
+
+    def write(self, payload):
+        width, height = self.size
+        self._chunk(b'fcTL', struct.pack('>IIIIIHHBB', self._next_sequence(), width, height, 0, 0,
+                                         self.duration, 1000, 0, 0))
+        if self.frame == 0:
+            self._chunk(b'IDAT', payload)
+        else:
+            self._chunk(b'fdAT', struct.pack('>I', self._next_sequence()) + payload)
+        self.frame += 1
+
+    def close(self):
+        self._chunk(b'IEND', b'')
+
+
+WRITERS = {'gif': GifWriter, 'apng': ApngWriter}
+
+
+# --- Export ---
+
+_sources = {}
+
+
+def _encoded_frame(task):
+    """Worker: renders and encodes one (problem, value, dpi, fmt, duration) frame."""
+    name, value, dpi, fmt, duration = task
+    if (name, dpi) not in _sources:
+        _sources[name, dpi] = FrameSource(name, dpi)
+    image = _sources[name, dpi].render(value)
+    return encode_gif_frame(image, duration) if fmt == 'gif' else encode_png_frame(image)
+
+
+def _bounded_map(pool, func, tasks, window):
+    """Like pool.map, but with at most `window` results submitted ahead of the consumer."""
+    pending = deque()
+    for task in tasks:
+        pending.append(pool.submit(func, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def driver_path(name, frames, start=None, stop=None):
+    _, lo, hi = PROBLEMS[name].sweep
+    return np.linspace(lo if start is None else start, hi if stop is None else stop, frames)
+
+
+def export(name, path, fmt='gif', frames=120, fps=25, dpi=80, jobs=1, start=None, stop=None):
+    """Writes a clip of `frames` frames sweeping the driver of `name`; returns `path`."""
+    values = driver_path(name, frames, start, stop)
+    duration = int(round(1000 / fps))
+    source = FrameSource(name, dpi)
+    try:
+        with open(path, 'wb') as fp:
+            writer = WRITERS[fmt](fp, source.size, frames, duration)
+            if jobs == 1:
+                for value in values:
+                    writer.write(writer.encode(source.render(value)))
+            else:
+                workers = jobs or os.cpu_count() or 1
+                tasks = ((name, float(value), dpi, fmt, duration) for value in values)
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    for payload in _bounded_map(pool, _encoded_frame, tasks, 2 * workers):
+                        writer.write(payload)
+            writer.close()
+    finally:
+        source.close()
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export parameter sweeps as GIF or animated PNG.')
+    parser.add_argument('problems', nargs='*', metavar='problem', help=f"default: {', '.join(ANIMATIONS)}")
+    parser.add_argument('--out', default='clips', help='output directory (default: clips)')
+    parser.add_argument('--format', default='gif', choices=list(FORMATS))
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--fps', type=float, default=25)
+    parser.add_argument('--dpi', type=int, default=80)
+    parser.add_argument('--range', type=float, nargs=2, metavar=('START', 'STOP'),
+                        help='driver range (default: the sweep range of the problem)')
+    parser.add_argument('--jobs', type=int, default=1, help='rendering processes (0: all cores)')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.problems if name not in ANIMATIONS]
+    if unknown:
+        parser.error(f"unknown or static problem(s): {', '.join(unknown)}")
+
+    start, stop = args.range or (None, None)
+    os.makedirs(args.out, exist_ok=True)
+    for name in args.problems or ANIMATIONS:
+        path = os.path.join(args.out, name + FORMATS[args.format])
+        print(export(name, path, args.format, args.frames, args.fps, args.dpi, args.jobs, start, stop))
+
+
+if __name__ == '__main__':
+    main()
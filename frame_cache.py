@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+
+class FrameCache:
+    """
+    Keeps rendered frames of a figure for driver values that were already shown.
+
+    The driver value is snapped to multiples of `step` (about one pixel), so
+    dragging back over a visited position produces the same key. Frames are
+    the RGBA buffers saved with `canvas.copy_from_bbox`; the BlitManager keys
+    them by (driver key, view) and, on a hit, restores the stored buffer
+    instead of drawing the animated artists. The least recently used frames
+    are dropped once their total size exceeds `budget_mb`, and the whole
+    cache is cleared whenever the BlitManager recaptures its background.
+    """
+
+    def __init__(self, step, budget_mb=256):
+        self.step = step
+        self.budget = int(budget_mb * 2 ** 20)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()  # key -> (region, nbytes)
+
+    def quantize(self, value):
+        """Returns (key, snapped value) for a driver value."""
+        index = round(value / self.step)
+        return index, index * self.step
+
+    def get(self, key):
+        entry = self._frames.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._frames.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, region, nbytes):
+        if nbytes > self.budget:
+            return
+        old = self._frames.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        self._frames[key] = (region, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.budget:
+            _, (_, size) = self._frames.popitem(last=False)
+            self.nbytes -= size
+
+    def clear(self):
+        self._frames.clear()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._frames)
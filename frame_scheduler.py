@@ -0,0 +1,63 @@
+import time
+
+_EMPTY = object()
+
+
+class FrameScheduler:
+    """
+    Collapses bursts of drag events into at most one geometry update per frame.
+
+    `submit()` only remembers the latest arguments. The first event after an
+    idle period is handled immediately; events arriving within the same frame
+    are coalesced and the last one is delivered when the frame timer fires.
+    With `fps=None` every submitted event is handled synchronously.
+    """
+
+    def __init__(self, canvas, callback, fps=60):
+        self.callback = callback
+        self.fps = fps
+        self._pending = _EMPTY
+        self._last_run = float('-inf')
+        self._armed = False
+        self._timer = None
+
+        if fps:
+            self._frame = 1.0 / fps
+            self._timer = canvas.new_timer(interval=max(1, int(1000 * self._frame)))
+            self._timer.single_shot = True
+            self._timer.add_callback(self._run_pending)
+
+    def submit(self, *args):
+        """Queues an update; only the most recent arguments are kept."""
+        self._pending = args
+        if self._timer is None:
+            self._run_pending()
+            return
+        if self._armed:
+            return
+
+        wait = self._frame - (time.perf_counter() - self._last_run)
+        if wait <= 0:
+            self._run_pending()
+        else:
+            self._armed = True
+            self._timer.interval = max(1, int(1000 * wait))
+            self._timer.start()
+
+    def flush(self):
+        """Delivers the pending update right away (e.g. on mouse release)."""
+        if self._armed:
+            self._timer.stop()
+        self._run_pending()
+
+    @property
+    def has_pending(self):
+        return self._pending is not _EMPTY
+
+    def _run_pending(self):
+        self._armed = False
+        if self._pending is _EMPTY:
+            return
+        args, self._pending = self._pending, _EMPTY
+        self._last_run = time.perf_counter()
+        self.callback(*args)
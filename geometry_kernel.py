@@ -0,0 +1,206 @@
+"""
+Incremental constraint-graph kernel for the interactive constructions.
+
+A Scene is a dependency graph: free points are set from the outside, and every
+other node (line, perpendicular, intersection, rotation, midpoint, circle or a
+custom `derived` node) is a function of its parents. Artists are bound to
+nodes with `bind`. After `set()`, `solve()` re-evaluates only the nodes
+downstream of what moved, in creation (= topological) order, and stops
+wherever a value comes out unchanged. `apply()` then calls only the bindings
+whose nodes changed. `update()` does both.
+
+Solving and applying can run on different threads (see geometry_worker): the
+solving side passes `snapshot()` along with the changed nodes, and
+`apply(changed, values)` reads the snapshot instead of the live node values.
+
+Values are plain tuples of floats:
+    point   (x, y)
+    line    (px, py, dx, dy)      a point on the line and its direction
+    circle  (cx, cy, r)
+"""
+import heapq
+import math
+
+from homogeneous import cos_sin
+
+NAN_POINT = (math.nan, math.nan)
+
+
+class Node:
+    __slots__ = ('id', 'parents', 'children', 'compute', 'value', 'bindings')
+
+    def __init__(self, id, parents, compute, value):
+        self.id = id
+        self.parents = parents
+        self.children = []
+        self.compute = compute
+        self.value = value
+        self.bindings = []
+
+    @property
+    def is_free(self):
+        return self.compute is None
+
+
+# --- Geometry on value tuples ---
+
+def line_through(p, q):
+    return (p[0], p[1], q[0] - p[0], q[1] - p[1])
+
+
+def perpendicular_through(line, p):
+    return (p[0], p[1], -line[3], line[2])
+
+
+def intersect(l1, l2):
+    """Intersection point of two lines, NaN when they are parallel."""
+    cross = l1[2] * l2[3] - l1[3] * l2[2]
+    if cross == 0:
+        return NAN_POINT
+    t = ((l2[0] - l1[0]) * l2[3] - (l2[1] - l1[1]) * l2[2]) / cross
+    return (l1[0] + t * l1[2], l1[1] + t * l1[3])
+
+
+def rotate_about(p, center, cos_a, sin_a):
+    vx, vy = p[0] - center[0], p[1] - center[1]
+    return (center[0] + cos_a * vx - sin_a * vy, center[1] + sin_a * vx + cos_a * vy)
+
+
+class Scene:
+    def __init__(self):
+        self.nodes = []
+        self._moved = set()
+        self._bindings = []
+
+    def _add(self, compute, parents, value=None):
+        if compute is not None:
+            value = compute(*(p.value for p in parents))
+        node = Node(len(self.nodes), tuple(parents), compute, value)
+        for parent in node.parents:
+            parent.children.append(node)
+        self.nodes.append(node)
+        return node
+
+    # --- Node constructors ---
+
+    def point(self, x, y):
+        """A free point; move it with `set`."""
+        return self._add(None, (), (float(x), float(y)))
+
+    def derived(self, compute, *parents):
+        """A node computed by `compute(*parent_values)`."""
+        return self._add(compute, parents)
+
+    def line(self, p, q):
+        return self._add(line_through, (p, q))
+
+    def perpendicular(self, line, through):
+        return self._add(perpendicular_through, (line, through))
+
+    def intersection(self, l1, l2):
+        return self._add(intersect, (l1, l2))
+
+    def rotation(self, p, center, degrees):
+        """p rotated counter-clockwise around center by a fixed angle."""
+        cos_a, sin_a = cos_sin(degrees)
+        return self._add(lambda pv, cv: rotate_about(pv, cv, cos_a, sin_a), (p, center))
+
+    def midpoint(self, p, q):
+        return self._add(lambda a, b: ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2), (p, q))
+
+    def circle(self, center, through):
+        """Circle around `center` passing through the point `through`."""
+        return self._add(lambda c, t: (c[0], c[1], math.hypot(t[0] - c[0], t[1] - c[1])), (center, through))
+
+    # --- Bindings ---
+
+    def bind(self, nodes, callback):
+        """Calls `callback(*values)` whenever one of `nodes` changes."""
+        binding = (len(self._bindings), tuple(nodes), callback)
+        self._bindings.append(binding)
+        for node in binding[1]:
+            node.bindings.append(binding)
+        return binding
+
+    # --- Evaluation ---
+
+    def set(self, node, value):
+        if not node.is_free:
+            raise ValueError("only free points can be set")
+        if value != node.value:
+            node.value = value
+            self._moved.add(node)
+
+    def solve(self):
+        """Re-evaluates the nodes downstream of the moved points; returns the set of changed nodes."""
+        changed = set(self._moved)
+        self._moved.clear()
+        heap = [child.id for node in changed for child in node.children]
+        heapq.heapify(heap)
+        done = set()
+        while heap:
+            node_id = heapq.heappop(heap)
+            if node_id in done:
+                continue
+            done.add(node_id)
+            node = self.nodes[node_id]
+            value = node.compute(*(p.value for p in node.parents))
+            if value != node.value:
+                node.value = value
+                changed.add(node)
+                for child in node.children:
+                    heapq.heappush(heap, child.id)
+        return changed
+
+    def snapshot(self):
+        """The current value of every node, indexed by node id."""
+        return [node.value for node in self.nodes]
+
+    def apply(self, changed, values=None):
+        """Runs each binding touching a changed node once, in binding order (with `values` from a snapshot)."""
+        bindings = {binding[0]: binding for node in changed for binding in node.bindings}
+        for key in sorted(bindings):
+            _, nodes, callback = bindings[key]
+            if values is None:
+                callback(*(node.value for node in nodes))
+            else:
+                callback(*(values[node.id] for node in nodes))
+
+    def update(self):
+        changed = self.solve()
+        self.apply(changed)
+        return changed
+
+    def refresh(self):
+        """Runs every binding (e.g. once after building the figure)."""
+        self.apply(self.nodes)
+
+
+def merge_updates(older, newer):
+    """Folds an unapplied (key, changed, values) update into the next one: changed nodes of both, newer values."""
+    return newer[0], older[1] | newer[1], newer[2]
+
+
+# --- Binding callbacks for matplotlib artists ---
+
+def polyline(line2d):
+    """Sets a Line2D through the bound points."""
+    return lambda *points: line2d.set_data([p[0] for p in points], [p[1] for p in points])
+
+
+def marker(line2d):
+    """Moves a single-point Line2D marker to the bound point."""
+    return lambda p: line2d.set_data([p[0]], [p[1]])
+
+
+def label(text, dx=0.0, dy=0.0):
+    """Keeps a Text at a fixed offset from the bound point."""
+    return lambda p: text.set_position((p[0] + dx, p[1] + dy))
+
+
+def circle_patch(patch):
+    """Moves and resizes a Circle patch to the bound circle."""
+    def update(c):
+        patch.set_center((c[0], c[1]))
+        patch.set_radius(c[2])
+    return update
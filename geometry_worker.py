@@ -0,0 +1,124 @@
+import threading
+import time
+import traceback
+
+_EMPTY = object()
+
+
+class GeometryWorker:
+    """
+    Solves drag updates on a background thread and hands only the newest result to the GUI thread.
+
+    Drop-in alternative to FrameScheduler for figures whose update splits into
+    `solve(*args) -> result` (pure computation, run on the worker thread) and
+    `callback(result)` (artist updates and drawing, run on the GUI thread).
+
+    `submit()` only swaps the request slot under a lock, so input handling
+    never waits on a solve; a request that is replaced before the worker picks
+    it up is dropped. Finished results go into a single result slot, and a
+    canvas timer on the GUI thread applies whatever is there once per frame.
+    When results pile up faster than frames, `merge(old, new)` folds the older
+    one into the newer (by default the older is simply discarded).
+    With `fps=None` every request is solved and applied synchronously.
+
+    `solve_time` holds the seconds spent solving the result being applied
+    (summed over merged results), so callers can time the solve without
+    touching the worker thread.
+    """
+
+    def __init__(self, canvas, solve, callback, fps=60, merge=None):
+        self.solve = solve
+        self.callback = callback
+        self.merge = merge
+        self.fps = fps
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._request = _EMPTY
+        self._result = _EMPTY
+        self._busy = False
+        self._closed = False
+        self._timer = None
+        self._polling = False
+        self.dropped = 0  # requests replaced before they were solved
+        self.solve_time = 0.0
+
+        if fps:
+            self._timer = canvas.new_timer(interval=max(1, int(1000 / fps)))
+            self._timer.add_callback(self._poll)
+            self._thread = threading.Thread(target=self._run, name='geometry-worker', daemon=True)
+            self._thread.start()
+            canvas.mpl_connect('close_event', lambda event: self.close())
+
+    # --- GUI thread ---
+
+    def submit(self, *args):
+        """Queues a request; a request still waiting for the worker is replaced."""
+        if self._timer is None:
+            start = time.perf_counter()
+            result = self.solve(*args)
+            self.solve_time = time.perf_counter() - start
+            self.callback(result)
+            return
+        with self._lock:
+            if self._request is not _EMPTY:
+                self.dropped += 1
+            self._request = args
+            self._wake.notify()
+        if not self._polling:
+            self._polling = True
+            self._timer.start()
+
+    def flush(self):
+        """Applies a finished result right away; never waits for a solve still in progress."""
+        if self._timer is not None:
+            self._poll()
+
+    @property
+    def has_pending(self):
+        with self._lock:
+            return self._request is not _EMPTY or self._busy or self._result is not _EMPTY
+
+    def _poll(self):
+        with self._lock:
+            finished, self._result = self._result, _EMPTY
+            idle = self._request is _EMPTY and not self._busy
+        if finished is not _EMPTY:
+            result, self.solve_time = finished
+            self.callback(result)
+        if idle and finished is _EMPTY and self._polling:
+            self._polling = False
+            self._timer.stop()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        if self._timer is not None:
+            self._timer.stop()
+
+    # --- Worker thread ---
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._request is _EMPTY and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                args, self._request = self._request, _EMPTY
+                self._busy = True
+            start = time.perf_counter()
+            try:
+                result = self.solve(*args)
+            except Exception:
+                # A failed solve drops that request; the worker keeps serving the next ones
+                traceback.print_exc()
+                result = _EMPTY
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                if result is not _EMPTY:
+                    if self._result is not _EMPTY and self.merge is not None:
+                        older, older_time = self._result
+                        result, elapsed = self.merge(older, result), older_time + elapsed
+                    self._result = (result, elapsed)
+                self._busy = False
@@ -0,0 +1,95 @@
+import math
+
+
+class HandleIndex:
+    """
+    Finds the draggable handle under the cursor without asking every artist.
+
+    Handles are single-point Line2D markers. Their display positions are kept
+    in a uniform grid whose cells are as large as the biggest pick radius, so a
+    query only looks at the 3x3 cells around the cursor. The whole index is
+    rebuilt only when the view transform changes (zoom, pan, resize, dpi); a
+    handle that moved is re-bucketed on its own after `moved()`.
+    """
+
+    def __init__(self, ax):
+        self.ax = ax
+        self._handles = {}  # artist -> (key, radius_pt)
+        self._pos = {}  # artist -> (x, y, radius_px, cell)
+        self._grid = {}
+        self._cell = 1.0
+        self._view = None
+        self._dirty = set()
+
+    def add(self, artist, key=None):
+        """Registers a marker artist; `find` returns `key` (the artist itself by default)."""
+        radius_pt = max(artist.get_pickradius(), artist.get_markersize() / 2)
+        self._handles[artist] = (artist if key is None else key, radius_pt)
+        self._view = None  # cell size may change
+        return artist
+
+    def remove(self, artist):
+        self._handles.pop(artist, None)
+        self._view = None
+
+    def moved(self, artist):
+        """Marks a handle whose data position changed since the last query."""
+        if artist in self._handles:
+            self._dirty.add(artist)
+
+    def _view_key(self):
+        # Two transformed points pin down the (linear) data-to-display mapping
+        (x0, y0), (x1, y1) = self.ax.transData.transform([(0, 0), (1, 1)])
+        return (x0, y0, x1, y1, self.ax.figure.dpi)
+
+    def _insert(self, artist):
+        (x, y), = self.ax.transData.transform(artist.get_xydata()[:1])
+        radius = self._handles[artist][1] * self.ax.figure.dpi / 72
+        cell = (math.floor(x / self._cell), math.floor(y / self._cell))
+        self._pos[artist] = (x, y, radius, cell)
+        self._grid.setdefault(cell, []).append(artist)
+
+    def _discard(self, artist):
+        entry = self._pos.pop(artist, None)
+        if entry is not None:
+            bucket = self._grid[entry[3]]
+            bucket.remove(artist)
+            if not bucket:
+                del self._grid[entry[3]]
+
+    def rebuild(self):
+        self._grid.clear()
+        self._pos.clear()
+        self._dirty.clear()
+        dpi = self.ax.figure.dpi
+        self._cell = max([r for _, r in self._handles.values()], default=1.0) * dpi / 72 or 1.0
+        for artist in self._handles:
+            self._insert(artist)
+        self._view = self._view_key()
+
+    def _refresh(self):
+        if self._view != self._view_key():
+            self.rebuild()
+            return
+        for artist in self._dirty:
+            self._discard(artist)
+            if artist in self._handles:
+                self._insert(artist)
+        self._dirty.clear()
+
+    def find(self, event):
+        """Returns the key of the nearest handle within its pick radius of the event, or None."""
+        if event.inaxes is not self.ax or not self._handles:
+            return None
+        self._refresh()
+
+        cx, cy = math.floor(event.x / self._cell), math.floor(event.y / self._cell)
+        best, best_d2 = None, math.inf
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for artist in self._grid.get((cx + dx, cy + dy), ()):
+                    x, y, radius, _ = self._pos[artist]
+                    d2 = (x - event.x) ** 2 + (y - event.y) ** 2
+                    if d2 <= radius * radius and d2 < best_d2 and artist.get_visible():
+                        best, best_d2 = artist, d2
+        return None if best is None else self._handles[best][0]
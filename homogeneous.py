@@ -0,0 +1,105 @@
+"""
+Plane geometry in homogeneous coordinates on stacked arrays.
+
+Points and lines are triples of broadcastable arrays (or floats), one entry
+per component, so every operation is a few whole-array multiplications:
+    point (x, y, w)   the Cartesian point (x/w, y/w); w = 0 is a direction
+    line  (a, b, c)   the line a*x + b*y + c*w = 0
+
+Joining two points and meeting two lines are both cross products, so there
+are no slopes, no special cases for vertical lines and no data-dependent
+branches: parallel lines meet in a point at infinity (w = 0), which turns into
+inf/nan only when converted back with `cartesian`. Fixed points stay plain
+floats and broadcast against the sweep arrays.
+"""
+import math
+
+import numpy as np
+
+
+def cos_sin(degrees):
+    """cos and sin of a fixed angle, exact for multiples of 90 degrees."""
+    exact = {0: (1.0, 0.0), 90: (0.0, 1.0), 180: (-1.0, 0.0), 270: (0.0, -1.0)}
+    key = degrees % 360
+    if key in exact:
+        return exact[key]
+    rad = math.radians(degrees)
+    return math.cos(rad), math.sin(rad)
+
+
+# --- Conversion ---
+
+def point(x, y):
+    """Homogeneous point (x, y, 1); x and y may be arrays."""
+    return (x, y, 1.0)
+
+
+def cartesian(p):
+    """(..., 2) array of Cartesian points; points at infinity come out as inf/nan."""
+    x, y, w = p
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.stack(np.broadcast_arrays(np.divide(x, w), np.divide(y, w)), axis=-1)
+
+
+# --- Incidence ---
+
+def cross(u, v):
+    return (u[1] * v[2] - u[2] * v[1],
+            u[2] * v[0] - u[0] * v[2],
+            u[0] * v[1] - u[1] * v[0])
+
+
+def join(p, q):
+    """Line through two points (or through a point in a direction, when q has w = 0)."""
+    return cross(p, q)
+
+
+def meet(l, m):
+    """Intersection of two lines; a point at infinity when they are parallel."""
+    return cross(l, m)
+
+
+def direction(p, q):
+    """Direction from p to q as a point at infinity, without dividing by w."""
+    return (q[0] * p[2] - p[0] * q[2], q[1] * p[2] - p[1] * q[2], 0.0)
+
+
+def perpendicular(l, p):
+    """Line through p perpendicular to l (it passes through l's normal direction)."""
+    return join(p, (l[0], l[1], 0.0))
+
+
+def is_left(p, threshold=0.0):
+    """Mask of the points whose x-coordinate is below `threshold` (compared without dividing by w)."""
+    return (p[0] - threshold * p[2]) * p[2] < 0
+
+
+def select(mask, p, q):
+    """Elementwise p where mask is true, q elsewhere."""
+    return tuple(np.where(mask, a, b) for a, b in zip(p, q))
+
+
+# --- Transformations ---
+
+def rotation(center, degrees):
+    """3x3 matrix rotating counter-clockwise by a fixed angle around a Cartesian center."""
+    c, s = cos_sin(degrees)
+    cx, cy = center
+    return ((c, -s, cx - c * cx + s * cy),
+            (s, c, cy - s * cx - c * cy),
+            (0.0, 0.0, 1.0))
+
+
+def transform(p, matrix):
+    """Applies a 3x3 matrix to a point (a direction, w = 0, is only rotated)."""
+    return tuple(m0 * p[0] + m1 * p[1] + m2 * p[2] for m0, m1, m2 in matrix)
+
+
+def rotate(p, center, degrees):
+    return transform(p, rotation(center, degrees))
+
+
+def turn(d, degrees):
+    """Rotates a direction (w = 0) counter-clockwise by a fixed angle."""
+    c, s = cos_sin(degrees)
+    return (c * d[0] - s * d[1], s * d[0] + c * d[1], 0.0)
@@ -0,0 +1,241 @@
+"""
+Opt-in timing of the drag hot path, with a live overlay and a profiler switch.
+
+    probe = Instrumentation(plot)     # plot: any Interactive* figure object
+    ...
+    print(probe.summary())
+    probe.detach()
+
+Nothing in the figure classes knows about this module: attaching replaces a
+few methods on the *instances* (frame scheduler, geometry solve, blitter or
+canvas draw) with timed wrappers, and `detach()` puts the originals back. A
+figure that was never instrumented therefore pays nothing.
+
+Every delivered frame produces one record:
+    latency  first queued event until the frame is drawn
+    solve    geometry solve (Scene.solve, or the parabola resampling); with a
+             GeometryWorker the worker reports it, since it solves off the GUI thread
+    update   rest of the frame callback (artist updates and plain-Python geometry)
+    draw     blit or canvas draw
+    queue    number of events coalesced into the frame
+The overlay in the top-left corner shows the frame rate and recent latencies;
+it lags one frame behind, since it is drawn as part of the frame it reports.
+Press F9 in the figure to start the profiler and F9 again to write a .prof file.
+"""
+import cProfile
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+PHASES = ('latency', 'solve', 'update', 'draw')
+
+
+class Instrumentation:
+    def __init__(self, plot, overlay=True, history=300, profile_dir='.', profile_key='f9'):
+        self.plot = plot
+        self.fig = plot.fig
+        self.records = deque(maxlen=history)
+        self.profile_dir = profile_dir
+        self._profiler = None
+        self._wrapped = []
+        self._opened = None  # time of the first event of the frame being prepared
+        self._queued = 0
+        self._phases = dict.fromkeys(PHASES, 0.0)
+        self._frame = None  # (start, queue) of the frame whose draw is still to come
+        self._in_frame = 0
+        self._solver = None  # GeometryWorker reporting the solve time, if the plot uses one
+        self._frame_times = deque(maxlen=60)
+
+        self._hook_plot(plot)
+        self.overlay = self._make_overlay() if overlay else None
+        self._key_cid = self.fig.canvas.mpl_connect('key_press_event', self._on_key)
+        self._profile_key = profile_key
+
+    # --- Hooks ---
+
+    def watch(self, owner, attr, phase):
+        """Times `owner.attr` (a method or module function) as `phase`: 'frame', 'queue', 'solve' or 'draw'."""
+        func = getattr(owner, attr)
+        own = attr in getattr(owner, '__dict__', {})
+        handler = getattr(self, '_on_' + phase)
+
+        if phase == 'queue':
+            def timed(*args, **kwargs):
+                handler()
+                return func(*args, **kwargs)
+        elif phase == 'frame':
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                self._in_frame += 1
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._in_frame -= 1
+                    handler(start, time.perf_counter())
+        else:
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    handler(start, time.perf_counter())
+
+        setattr(owner, attr, timed)
+        self._wrapped.append((owner, attr, func if own else None))
+
+    def _hook_plot(self, plot):
+        schedulers = [obj.scheduler for obj in (plot, getattr(plot, 'dragger', None)) if hasattr(obj, 'scheduler')]
+        sliders = [value for name, value in vars(plot).items() if name.startswith('slider_')]
+        for scheduler in schedulers:
+            self.watch(scheduler, 'submit', 'queue')
+            self.watch(scheduler, 'callback', 'frame')
+        for slider in sliders:
+            self.watch(slider, 'set_val', 'frame')
+
+        # A GeometryWorker may call Scene.solve on its own thread; it times the solve itself
+        self._solver = next((scheduler for scheduler in schedulers if hasattr(scheduler, 'solve_time')), None)
+        if self._solver is None:
+            if hasattr(plot, 'scene'):
+                self.watch(plot.scene, 'solve', 'solve')
+            elif hasattr(plot, 'resample'):
+                self.watch(plot, 'resample', 'solve')
+
+        if hasattr(plot, 'blitter'):
+            self.watch(plot.blitter, 'update', 'draw')
+        else:
+            self.watch(self.fig.canvas, 'draw', 'draw')
+
+    def detach(self):
+        """Restores the original methods and removes the overlay."""
+        for owner, attr, original in reversed(self._wrapped):
+            if original is None:
+                delattr(owner, attr)
+            else:
+                setattr(owner, attr, original)
+        self._wrapped.clear()
+        self.fig.canvas.mpl_disconnect(self._key_cid)
+        if self._profiler is not None:
+            self.stop_profile()
+        if self.overlay is not None:
+            if hasattr(self.plot, 'blitter'):
+                self.plot.blitter.remove_artist(self.overlay)
+            self.overlay.remove()
+            self.overlay = None
+
+    # --- Recording ---
+
+    def _on_queue(self):
+        if self._opened is None:
+            self._opened = time.perf_counter()
+        self._queued += 1
+
+    def _on_solve(self, start, end):
+        if self._in_frame:
+            self._phases['solve'] += end - start
+
+    def _on_frame(self, start, end):
+        phases = self._phases
+        if self._solver is not None:
+            # The solve ran before the frame callback (on the worker thread, or just before it when synchronous)
+            phases['solve'] = self._solver.solve_time
+            phases['update'] = max(0.0, (end - start) - phases['draw'])
+        else:
+            phases['update'] = max(0.0, (end - start) - phases['solve'] - phases['draw'])
+        self._frame = (start if self._opened is None else self._opened, max(self._queued, 1))
+        self._opened, self._queued = None, 0
+        if phases['draw']:
+            self._close(end)
+
+    def _on_draw(self, start, end):
+        if self._in_frame:
+            self._phases['draw'] += end - start
+        elif self._frame is not None:
+            # Deferred draw (draw_idle on a GUI backend) of the last frame
+            self._phases['draw'] += end - start
+            self._close(end)
+
+    def _close(self, end):
+        opened, queue = self._frame
+        record = dict(self._phases, latency=end - opened, queue=queue)
+        self.records.append(record)
+        self._frame_times.append(end)
+        self._frame = None
+        self._phases = dict.fromkeys(PHASES, 0.0)
+        if self.overlay is not None:
+            self.overlay.set_text(self._overlay_text())
+
+    # --- Reporting ---
+
+    @property
+    def fps(self):
+        times = self._frame_times
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def stats(self):
+        """Percentiles (ms) of every phase over the recorded frames, plus the mean queue depth."""
+        if not self.records:
+            return {}
+        result = {}
+        for phase in PHASES:
+            ms = np.array([r[phase] for r in self.records]) * 1000
+            result[phase] = {f'p{p}': float(np.percentile(ms, p)) for p in (50, 95, 99)}
+        result['queue'] = float(np.mean([r['queue'] for r in self.records]))
+        return result
+
+    def summary(self):
+        stats = self.stats()
+        if not stats:
+            return 'no frames recorded'
+        lines = [f'{len(self.records)} frames, mean queue depth {stats["queue"]:.2f}']
+        for phase in PHASES:
+            s = stats[phase]
+            lines.append(f'  {phase:<8} p50 {s["p50"]:7.2f} ms   p95 {s["p95"]:7.2f} ms   p99 {s["p99"]:7.2f} ms')
+        return '\n'.join(lines)
+
+    def _make_overlay(self):
+        ax = getattr(self.plot, 'ax', None) or self.fig.axes[0]
+        text = ax.text(0.01, 0.99, '', transform=ax.transAxes, ha='left', va='top',
+                       family='monospace', fontsize=8, zorder=100,
+                       bbox=dict(boxstyle='round,pad=0.3', fc='white', alpha=0.8))
+        if hasattr(self.plot, 'blitter'):
+            self.plot.blitter.add_artist(text)
+        return text
+
+    def _overlay_text(self):
+        last = self.records[-1]
+        recent = np.array([r['latency'] for r in self.records][-60:]) * 1000
+        return (f'{self.fps:5.1f} fps   latency {recent[-1]:6.2f} ms (p95 {np.percentile(recent, 95):6.2f})\n'
+                f'solve {last["solve"] * 1000:5.2f}  update {last["update"] * 1000:5.2f}  '
+                f'draw {last["draw"] * 1000:5.2f} ms   queue {last["queue"]}')
+
+    # --- Profiling ---
+
+    def start_profile(self):
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop_profile(self, path=None):
+        """Stops the profiler and writes its stats (readable with pstats/snakeviz); returns the path."""
+        if self._profiler is None:
+            return None
+        profiler, self._profiler = self._profiler, None
+        profiler.disable()
+        if path is None:
+            name = type(self.plot).__name__
+            path = os.path.join(self.profile_dir, f'{name}-{time.strftime("%Y%m%d-%H%M%S")}.prof')
+        profiler.dump_stats(path)
+        return path
+
+    def _on_key(self, event):
+        if event.key != self._profile_key:
+            return
+        if self._profiler is None:
+            self.start_profile()
+            print('profiling... press', self._profile_key.upper(), 'again to stop')
+        else:
+            print('profile written to', self.stop_profile())
@@ -0,0 +1,196 @@
+"""
+Checks the claims of the geometry proofs over large grids of configurations.
+
+    python invariant_sweep.py                       # both problems, 100 x 100 x 100 configurations each
+    python invariant_sweep.py t004 --grid 300 --samples 200 --jobs 8
+
+t003-3: the quadrilateral is A(0, a), B(-b, 0), D(a, 0) with AB perpendicular
+        to BC and AB = BC, i.e. C(a - b, -b); P runs along the x-axis beyond D.
+        Claim: F' lies on line QC (part 3).
+t004:   A(0, a), B(b, 0), E(0, e) on the positive y-axis.
+        Claims: A, O, D, B are concyclic, so angle ODB = angle OAB (part 2);
+        D lies on the circle with diameter CB (the auxiliary circle).
+
+The flattened parameter grid and the residual arrays live in shared memory;
+worker processes read their slice of the grid and write their residuals in
+place, so nothing but slice bounds is pickled. The report lists the largest
+residual of each claim (relative lengths or radians) and where it occurs.
+"""
+import argparse
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import batch_solvers
+from locus import half_line, open_interval
+
+Sweep = namedtuple('Sweep', ['params', 'checks', 'grid', 'residuals'])
+
+
+def _grid(*axes):
+    """All combinations of the axis values, as an (N, len(axes)) array."""
+    return np.stack([g.ravel() for g in np.meshgrid(*axes, indexing='ij')], axis=-1)
+
+
+def _norm(v):
+    return np.hypot(v[..., 0], v[..., 1])
+
+
+def _collinear(c, p, q):
+    """|sin| of the angle PCQ: zero when P, C and Q are collinear."""
+    u, v = p - c, q - c
+    return np.abs(u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]) / (_norm(u) * _norm(v))
+
+
+def _on_circle(p, a, b):
+    """Relative distance of P from the circle with diameter AB."""
+    r = _norm(b - a) / 2
+    return np.abs(_norm(p - (a + b) / 2) - r) / r
+
+
+def _angle(vertex, p, q):
+    u, v = p - vertex, q - vertex
+    return np.arctan2(np.abs(u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]), (u * v).sum(axis=-1))
+
+
+# --- t003-3 ---
+
+def problem3_grid(n, samples):
+    size = np.linspace(0.5, 10.0, n)
+    # P beyond D; the offset scales with the figure so every shape sees the same range
+    return _grid(size, size, half_line(0.0, 40.0, samples))
+
+
+def problem3_residuals(params):
+    a, b, offset = params.T
+    zero = np.zeros_like(a)
+    A = np.stack([zero, a], axis=-1)
+    B = np.stack([-b, zero], axis=-1)
+    C = np.stack([a - b, -b], axis=-1)
+    D = np.stack([a, zero], axis=-1)
+    Q, _, F_prime = batch_solvers.problem3_points(a + offset * np.maximum(a, b), A, B, C, D)
+    return {"F' on line QC": _collinear(C, Q, F_prime)}
+
+
+# --- t004 ---
+
+def geometry_grid(n, samples):
+    size = np.linspace(0.5, 10.0, n)
+    # E anywhere on the positive y-axis up to twice the height of A (never at A itself)
+    return _grid(size, size, open_interval(0.0, 2.0, samples))
+
+
+def geometry_residuals(params):
+    a, b, u = params.T
+    zero = np.zeros_like(a)
+    A = np.stack([zero, a], axis=-1)
+    B = np.stack([b, zero], axis=-1)
+    O = np.zeros_like(A)
+    _, C, D = batch_solvers.geometry_positions(u * a, A, B, O)
+    return {
+        'A, O, D, B concyclic': _on_circle(D, A, B),
+        'angle ODB = angle OAB': np.abs(_angle(D, O, B) - _angle(A, O, B)),
+        'D on the circle with diameter CB': _on_circle(D, C, B),
+    }
+
+
+SWEEPS = {
+    't003-3': Sweep(('a', 'b', 'p_x - D_x'), ("F' on line QC",), problem3_grid, problem3_residuals),
+    't004': Sweep(('a', 'b', 'e_y / a'),
+                  ('A, O, D, B concyclic', 'angle ODB = angle OAB', 'D on the circle with diameter CB'),
+                  geometry_grid, geometry_residuals),
+}
+
+
+# --- Shared-memory runner ---
+
+def _work(task):
+    """Worker: computes the residuals of rows start:stop of the shared grid into the shared output."""
+    name, grid_name, shape, out_name, start, stop = task
+    sweep = SWEEPS[name]
+    grid_shm = shared_memory.SharedMemory(name=grid_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        grid = np.ndarray(shape, dtype=float, buffer=grid_shm.buf)
+        out = np.ndarray((len(sweep.checks), shape[0]), dtype=float, buffer=out_shm.buf)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            residuals = sweep.residuals(grid[start:stop])
+        for i, check in enumerate(sweep.checks):
+            out[i, start:stop] = residuals[check]
+        del grid, out
+    finally:
+        grid_shm.close()
+        out_shm.close()
+    return stop - start
+
+
+def _shared_array(shape):
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+    return shm, np.ndarray(shape, dtype=float, buffer=shm.buf)
+
+
+def run_sweep(name, n=100, samples=100, jobs=None, chunk=200_000):
+    """Evaluates every claim of `name` on its grid; returns {check: (max residual, worst params, non-finite count)}."""
+    sweep = SWEEPS[name]
+    params = sweep.grid(n, samples)
+    grid_shm, grid = _shared_array(params.shape)
+    out_shm, out = _shared_array((len(sweep.checks), len(params)))
+    try:
+        grid[:] = params
+        del params
+        tasks = [(name, grid_shm.name, grid.shape, out_shm.name, start, min(start + chunk, len(grid)))
+                 for start in range(0, len(grid), chunk)]
+        if jobs == 1:
+            for task in tasks:
+                _work(task)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+                for _ in pool.map(_work, tasks):
+                    pass
+
+        report = {}
+        for check, residual in zip(sweep.checks, out):
+            finite = np.isfinite(residual)
+            worst = int(np.argmax(np.where(finite, residual, -np.inf)))
+            report[check] = (float(residual[worst]), dict(zip(sweep.params, grid[worst].tolist())),
+                             int(len(residual) - finite.sum()))
+        return len(grid), report
+    finally:
+        del grid, out
+        grid_shm.close()
+        grid_shm.unlink()
+        out_shm.close()
+        out_shm.unlink()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check the invariants of the geometry proofs on parameter grids.')
+    parser.add_argument('problems', nargs='*', metavar='problem', help=f"default: {', '.join(SWEEPS)}")
+    parser.add_argument('--grid', type=int, default=100, help='values per fixed-point parameter (default 100)')
+    parser.add_argument('--samples', type=int, default=100, help='driver positions per configuration (default 100)')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--tol', type=float, default=1e-8, help='largest acceptable residual (default 1e-8)')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.problems if name not in SWEEPS]
+    if unknown:
+        parser.error(f"unknown problem(s): {', '.join(unknown)}")
+
+    failed = False
+    for name in args.problems or SWEEPS:
+        count, report = run_sweep(name, args.grid, args.samples, args.jobs)
+        print(f'{name}: {count:,} configurations')
+        for check, (residual, where, nonfinite) in report.items():
+            status = 'ok' if residual <= args.tol else 'FAILED'
+            at = ', '.join(f'{k}={v:.6g}' for k, v in where.items())
+            print(f'  {check:<34} max residual {residual:.3e}  ({at})  {status}'
+                  + (f'  [{nonfinite} degenerate]' if nonfinite else ''))
+            failed |= residual > args.tol
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
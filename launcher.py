@@ -0,0 +1,118 @@
+"""
+Single entry point for the problem figures.
+
+    python -m launcher --list
+    python -m launcher t002
+    python -m launcher t004 --headless --budget 1.5
+    python -m launcher t002 --instrument
+
+Problems are discovered without importing them, and only the requested script
+is imported. matplotlib is not imported before that. After the first frame is
+drawn, the launcher prints the time-to-first-frame split into import, build
+and draw. With --budget it warns, and in --headless mode exits with status 1,
+when the total exceeds the budget. --instrument attaches the latency overlay
+and F9 profiler switch of instrumentation.Instrumentation to interactive figures.
+"""
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import sys
+
+from problems import PROBLEMS, load_problem
+
+
+class FirstFrameTimer:
+    """Reports the startup phases of one problem once its first frame has been drawn."""
+
+    def __init__(self, name, budget=None):
+        self.name = name
+        self.budget = budget
+        self.marks = [('start', _START)]
+        self.total = None
+        self._cids = []
+
+    def mark(self, phase):
+        self.marks.append((phase, time.perf_counter()))
+
+    def watch(self, figures):
+        """Waits for the first draw_event of any of the figures."""
+        for fig in figures:
+            self._cids.append((fig.canvas, fig.canvas.mpl_connect('draw_event', self.on_draw)))
+
+    def on_draw(self, event):
+        for canvas, cid in self._cids:
+            canvas.mpl_disconnect(cid)
+        self._cids = []
+        self.mark('first frame')
+        self.report()
+
+    def report(self):
+        self.total = self.marks[-1][1] - _START
+        phases = ', '.join(f'{phase} {t - t_prev:.3f}s'
+                           for (_, t_prev), (phase, t) in zip(self.marks, self.marks[1:]))
+        print(f'{self.name}: {phases} (time-to-first-frame {self.total:.3f}s)')
+        if self.over_budget:
+            print(f'{self.name}: over the startup budget of {self.budget:.3f}s', file=sys.stderr)
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.total is not None and self.total > self.budget
+
+
+def launch(name, headless=False, budget=None, instrument=False):
+    """Opens (or, headless, renders once) one problem and returns its FirstFrameTimer."""
+    timer = FirstFrameTimer(name, budget)
+    if headless:
+        import matplotlib
+        matplotlib.use('Agg')
+
+    module = load_problem(name)
+    timer.mark('import')
+    plot = module.main(show=False)
+    timer.mark('build')
+
+    probe = None
+    if instrument and hasattr(plot, 'fig'):
+        from instrumentation import Instrumentation
+        probe = Instrumentation(plot)
+
+    import matplotlib.pyplot as plt
+
+    figures = [plt.figure(num) for num in plt.get_fignums()]
+    timer.watch(figures)
+    if headless:
+        for fig in figures:
+            fig.canvas.draw()
+    else:
+        plt.show()
+    if probe is not None:
+        print(probe.summary())
+    del plot
+    return timer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m launcher', description='Open one of the problem figures.')
+    parser.add_argument('problem', nargs='?', help='problem to open (see --list)')
+    parser.add_argument('--list', action='store_true', help='list the available problems and exit')
+    parser.add_argument('--headless', action='store_true', help='render one frame with Agg instead of opening a window')
+    parser.add_argument('--budget', type=float, default=None, metavar='SECONDS', help='time-to-first-frame budget')
+    parser.add_argument('--instrument', action='store_true', help='show a live latency overlay; F9 toggles profiling')
+    args = parser.parse_args(argv)
+
+    if args.list or args.problem is None:
+        for name, problem in PROBLEMS.items():
+            kind = 'interactive' if problem.sweep else 'static'
+            print(f'{name:<15} {problem.path:<18} {kind}')
+        return 0
+    if args.problem not in PROBLEMS:
+        parser.error(f"unknown problem {args.problem!r} (see --list)")
+
+    timer = launch(args.problem, headless=args.headless, budget=args.budget, instrument=args.instrument)
+    return 1 if args.headless and timer.over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
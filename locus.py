@@ -0,0 +1,52 @@
+"""
+Analytic loci of the dependent points, precomputed with the batched solvers.
+
+Instead of collecting the positions a user happened to drag through, the
+driver parameter is sampled over its whole domain once, the batched solver
+(see batch_solvers) maps all samples in one call, and the resulting polylines
+are kept per configuration. Jumps (asymptotes, branch switches) are broken
+with NaN rows so they do not draw as spurious segments.
+"""
+import numpy as np
+
+_cache = {}
+
+
+def open_interval(lo, hi, samples=2001):
+    """Evenly spaced samples of the open interval (lo, hi)."""
+    return np.linspace(lo, hi, samples + 2)[1:-1]
+
+
+def half_line(start, length, samples=2001, first_step=1e-3):
+    """Samples of (start, start + length], denser near `start` (geometric spacing)."""
+    return start + np.geomspace(first_step, length, samples)
+
+
+def break_jumps(points, max_jump):
+    """Inserts NaN rows between consecutive points farther apart than `max_jump`."""
+    points = np.asarray(points, dtype=float)
+    if max_jump is None or len(points) < 2:
+        return points
+    step = np.hypot(*np.diff(points, axis=0).T)
+    gaps = np.nonzero(~(step <= max_jump))[0] + 1
+    return np.insert(points, gaps, np.nan, axis=0)
+
+
+def compute_locus(key, solver, params, max_jump=None):
+    """
+    Returns the loci traced by `solver(params)`, computing them only once per `key`.
+
+    `solver` is a batched solver returning one (N, 2) array or a tuple of them;
+    the result is always a tuple of (M, 2) polylines. `key` must identify the
+    configuration (problem, fixed points, domain).
+    """
+    if key not in _cache:
+        result = solver(params)
+        if isinstance(result, np.ndarray):
+            result = (result,)
+        _cache[key] = tuple(break_jumps(points, max_jump) for points in result)
+    return _cache[key]
+
+
+def clear_cache():
+    _cache.clear()
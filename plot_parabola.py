@@ -1,7 +1,10 @@
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection
 from matplotlib.widgets import Slider
 
+from adaptive_sampling import axes_scale, sample_parabola
+
 
 # 二次曲线 y = a(x-h)**2 + k
 
@@ -10,90 +13,205 @@ init_a = 1.0
 init_h = 2.0
 init_k = 1.0
 
-# --- Create the figure and the main axes for the plot ---
-fig, ax = plt.subplots(figsize=(8, 8))
-# Adjust the main plot to make room for the sliders
-plt.subplots_adjust(left=0.1, bottom=0.35)
-
-# --- Generate initial data ---
-x = np.linspace(-10, 10, 400)
-y = init_a * (x - init_h)**2 + init_k
-
-# --- Plot the initial parabola ---
-line, = ax.plot(x, y, lw=2, color='blue')
-vertex_dot, = ax.plot(init_h, init_k, 'ro') # Mark the vertex
-
-# --- Set plot properties ---
-ax.set_title('Interactive Parabola: y = a(x - h)^2 + k')
-ax.set_xlabel('x-axis')
-ax.set_ylabel('y-axis')
-ax.grid(True)
-ax.axhline(0, color='black', linewidth=0.5)
-ax.axvline(0, color='black', linewidth=0.5)
-ax.set_xlim([-10, 10])
-ax.set_ylim([-10, 10])
-ax.set_aspect('equal', adjustable='box')
-
-# Add a text label for the vertex, which we will update
-vertex_text = ax.text(init_h, init_k, f'  ({init_h:.2f}, {init_k:.2f})', verticalalignment='bottom')
-
-# --- Create axes for the sliders ---
-ax_a = plt.axes([0.15, 0.20, 0.65, 0.03])
-ax_h = plt.axes([0.15, 0.15, 0.65, 0.03])
-ax_k = plt.axes([0.15, 0.10, 0.65, 0.03])
-
-# --- Create the Slider widgets ---
-slider_a = Slider(
-    ax=ax_a,
-    label='a',
-    valmin=-5.0,
-    valmax=5.0,
-    valinit=init_a
-)
-
-slider_h = Slider(
-    ax=ax_h,
-    label='h (vertex x)',
-    valmin=-10.0,
-    valmax=10.0,
-    valinit=init_h
-)
-
-slider_k = Slider(
-    ax=ax_k,
-    label='k (vertex y)',
-    valmin=-10.0,
-    valmax=10.0,
-    valinit=init_k
-)
-
-# --- The update function. This is called whenever a slider's value changes. ---
-def update(val):
-    # Get the current values from the sliders
-    a = slider_a.val
-    h = slider_h.val
-    k = slider_k.val
-    
-    # Recalculate the y-values
-    new_y = a * (x - h)**2 + k
-    
-    # Update the line data
-    line.set_ydata(new_y)
-    
-    # Update the vertex marker's position
-    vertex_dot.set_data([h], [k])
-    
-    # Update the vertex text label
-    vertex_text.set_position((h, k))
-    vertex_text.set_text(f'  ({h:.2f}, {k:.2f})')
-    
-    # Redraw the canvas
-    fig.canvas.draw_idle()
-
-# --- Register the update function with each slider ---
-slider_a.on_changed(update)
-slider_h.on_changed(update)
-slider_k.on_changed(update)
+# --- Family mode ---
+FAMILY_SAMPLES = 400  # x samples shared by all members of a family
+
+FAMILY_PARAMS = ('a', 'h', 'k')
+
+def family_members(a, h, k, family, relative=False):
+    """
+    (a, h, k) arrays of a family: every combination of the values listed in
+    `family`, e.g. {'a': np.linspace(-5, 5, 41)} or
+    {'h': np.linspace(-4, 4, 9), 'k': np.linspace(-4, 4, 9)}; parameters not
+    listed keep the slider value. With relative=True the listed values are
+    offsets added to the slider values instead.
+    """
+    axes = []
+    for name, value in zip(FAMILY_PARAMS, (a, h, k)):
+        if name not in family:
+            axes.append(np.array([value], dtype=float))
+        elif relative:
+            axes.append(value + np.asarray(family[name], dtype=float))
+        else:
+            axes.append(np.asarray(family[name], dtype=float))
+    return tuple(grid.ravel() for grid in np.meshgrid(*axes, indexing='ij'))
+
+def family_segments(a, h, k, xlim, samples=FAMILY_SAMPLES, out=None):
+    """All members on one shared x grid, as an (N, samples, 2) array; one broadcast for the whole family."""
+    x = np.linspace(*xlim, samples)
+    if out is None or out.shape != (len(a), samples, 2):
+        out = np.empty((len(a), samples, 2))
+    out[..., 0] = x
+    np.subtract(x, h[:, None], out=out[..., 1])
+    out[..., 1] **= 2
+    out[..., 1] *= a[:, None]
+    out[..., 1] += k[:, None]
+    return out
+
+class InteractiveParabola:
+    def __init__(self, a=init_a, h=init_h, k=init_k, family=None, color_by=None, cmap='viridis', relative=False):
+        # --- Optional family: parameter values (or offsets around the sliders), drawn as one LineCollection ---
+        unknown = sorted(set(family or ()) - set(FAMILY_PARAMS))
+        if unknown:
+            raise ValueError(f"family parameters must be among a, h, k, not {', '.join(unknown)}")
+        for name, values in (family or {}).items():
+            try:
+                array = np.asarray(values, dtype=float)
+            except (TypeError, ValueError):
+                raise ValueError(f'family values for {name} must be numbers, not {values!r}') from None
+            if array.size == 0 or not np.isfinite(array).all():
+                raise ValueError(f'family values for {name} must be a non-empty array of finite numbers, not {values!r}')
+        if color_by is not None and color_by not in FAMILY_PARAMS:
+            raise ValueError(f"color_by must be 'a', 'h' or 'k', not {color_by!r}")
+        self.family = family
+        self.relative = relative
+        self.color_by = color_by or (next(iter(family)) if family else None)
+        self._segments = None
+
+        # --- Create the figure and the main axes for the plot ---
+        self.fig, self.ax = plt.subplots(figsize=(8, 8))
+        # Adjust the main plot to make room for the sliders
+        self.fig.subplots_adjust(left=0.1, bottom=0.35)
+
+        self.init_plot(h, k)
+        if family:
+            self.init_family(cmap)
+        self.init_sliders(a, h, k)
+        self.resample()
+
+        # --- Re-sample the visible part of the curve after zoom/pan or resize ---
+        self.ax.callbacks.connect('xlim_changed', self.on_view_changed)
+        self.ax.callbacks.connect('ylim_changed', self.on_view_changed)
+        self.fig.canvas.mpl_connect('resize_event', self.on_view_changed)
+
+    def init_plot(self, h, k):
+        ax = self.ax
+
+        # --- Plot the initial parabola (data is filled in by resample) ---
+        self.line, = ax.plot([], [], lw=2, color='blue')
+        self.vertex_dot, = ax.plot(h, k, 'ro') # Mark the vertex
+
+        # --- Set plot properties ---
+        ax.set_title('Interactive Parabola: y = a(x - h)^2 + k')
+        ax.set_xlabel('x-axis')
+        ax.set_ylabel('y-axis')
+        ax.grid(True)
+        ax.axhline(0, color='black', linewidth=0.5)
+        ax.axvline(0, color='black', linewidth=0.5)
+        ax.set_xlim([-10, 10])
+        ax.set_ylim([-10, 10])
+        ax.set_aspect('equal', adjustable='box')
+
+        # Add a text label for the vertex, which we will update
+        self.vertex_text = ax.text(h, k, f'  ({h:.2f}, {k:.2f})', verticalalignment='bottom')
+
+    def init_family(self, cmap):
+        # --- Every member in one artist, coloured by its value of `color_by` ---
+        self.family_lines = LineCollection([], cmap=cmap, linewidths=1, alpha=0.8, zorder=1)
+        self.ax.add_collection(self.family_lines, autolim=False)
+        self.fig.colorbar(self.family_lines, ax=self.ax, shrink=0.8, label=self.color_by)
+        self.ax.set_title(f'Family of y = a(x - h)^2 + k over {", ".join(self.family)}')
+
+    def init_sliders(self, a, h, k):
+        # --- Create axes for the sliders ---
+        ax_a = self.fig.add_axes([0.15, 0.20, 0.65, 0.03])
+        ax_h = self.fig.add_axes([0.15, 0.15, 0.65, 0.03])
+        ax_k = self.fig.add_axes([0.15, 0.10, 0.65, 0.03])
+
+        # --- Create the Slider widgets ---
+        self.slider_a = Slider(
+            ax=ax_a,
+            label='a',
+            valmin=-5.0,
+            valmax=5.0,
+            valinit=a
+        )
+
+        self.slider_h = Slider(
+            ax=ax_h,
+            label='h (vertex x)',
+            valmin=-10.0,
+            valmax=10.0,
+            valinit=h
+        )
+
+        self.slider_k = Slider(
+            ax=ax_k,
+            label='k (vertex y)',
+            valmin=-10.0,
+            valmax=10.0,
+            valinit=k
+        )
+
+        # --- Register the update function with each slider ---
+        self.slider_a.on_changed(self.update)
+        self.slider_h.on_changed(self.update)
+        self.slider_k.on_changed(self.update)
+
+    def resample(self):
+        """Samples only the on-screen part of the curve, densest around the vertex."""
+        x, y = sample_parabola(self.slider_a.val, self.slider_h.val, self.slider_k.val,
+                               self.ax.get_xlim(), self.ax.get_ylim(), scale=axes_scale(self.ax))
+        self.line.set_data(x, y)
+        if self.family:
+            self.resample_family()
+
+    def resample_family(self):
+        """Re-evaluates the whole family in one vectorized pass over the visible x-range."""
+        members = dict(zip(FAMILY_PARAMS, family_members(self.slider_a.val, self.slider_h.val, self.slider_k.val,
+                                                         self.family, self.relative)))
+        self._segments = family_segments(members['a'], members['h'], members['k'], self.ax.get_xlim(), out=self._segments)
+        values = members[self.color_by]
+        self.family_lines.set_segments(self._segments)
+        self.family_lines.set_array(values)
+        self.family_lines.set_clim(values.min(), values.max())
+
+    def on_view_changed(self, _):
+        self.resample()
+
+    def set_params(self, a, h, k):
+        """Shows the figure as if it had been built with (a, h, k): sliders, their initial marks and the curves."""
+        for slider, value in zip((self.slider_a, self.slider_h, self.slider_k), (a, h, k)):
+            slider.valinit = value
+            slider.vline.set_xdata([value, value])
+            eventson, slider.eventson = slider.eventson, False
+            slider.set_val(value)
+            slider.eventson = eventson
+        self.update(None)
+
+    # --- The update function. This is called whenever a slider's value changes. ---
+    def update(self, val):
+        # Get the current values from the sliders
+        h = self.slider_h.val
+        k = self.slider_k.val
+
+        # Recalculate and update the line data
+        self.resample()
+
+        # Update the vertex marker's position
+        self.vertex_dot.set_data([h], [k])
+
+        # Update the vertex text label
+        self.vertex_text.set_position((h, k))
+        self.vertex_text.set_text(f'  ({h:.2f}, {k:.2f})')
+
+        # Redraw the canvas
+        self.fig.canvas.draw_idle()
+
+    def show(self):
+        plt.show()
+
+def build_figure(a=init_a, h=init_h, k=init_k, family=None, relative=False):
+    """Builds the figure for y = a(x-h)^2 + k without showing it (for headless rendering)."""
+    return InteractiveParabola(a, h, k, family=family, relative=relative).fig
+
+def main(show=True, family=None, relative=False):
+    """Opens the interactive figure (a whole family with `family`); with show=False it is only built and returned."""
+    plot = InteractiveParabola(family=family, relative=relative)
+    if show:
+        plot.show()
+    return plot
 
 # Display the plot
-plt.show()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
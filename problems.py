@@ -0,0 +1,84 @@
+"""
+Registry of the problem scripts and a loader for them.
+
+The scripts have file names such as ``t001-2.py`` that cannot be imported with
+a plain ``import`` statement, so they are loaded from their paths instead.
+Every script provides ``build_figure(**params)``, which returns the finished
+figure without showing it, and ``main(show=True)``, which opens it.
+"""
+import importlib.util
+import os
+import sys
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Driver parameter of build_figure swept by render_assets: (parameter, start, stop)
+SWEEPS = {
+    't001-2': ('m', 4.5, 12.0),
+    't002': ('p_x', -10.0, 5.0),
+    't003-3': ('p_x', 3.5, 12.0),
+    't004': ('e_y', 0.1, 3.9),
+    'plot_parabola': ('a', -5.0, 5.0),
+}
+
+# Values the numeric build_figure parameters accept, as bounds exclusive unless closed
+Domain = namedtuple('Domain', ['low', 'high', 'closed'])
+
+DOMAINS = {
+    't001-2': {'m': Domain(4.0, 1e4, False)},            # M beyond A = (4, 0)
+    't002': {'p_x': Domain(-1e4, 1e4, False)},           # P anywhere on the x-axis
+    't003-3': {'p_x': Domain(3.0, 1e4, False)},          # P beyond D = (3, 0)
+    't004': {'e_y': Domain(0.0, 4.0, False)},            # E strictly between O and A
+    'plot_parabola': {                                   # the slider ranges
+        'a': Domain(-5.0, 5.0, True),
+        'h': Domain(-10.0, 10.0, True),
+        'k': Domain(-10.0, 10.0, True),
+    },
+}
+
+# sweep is None for static figures
+Problem = namedtuple('Problem', ['name', 'path', 'sweep'])
+
+
+def discover_problems(root=ROOT):
+    """
+    Finds the problem scripts by reading, not importing, the files in `root`:
+    any top-level script that defines `build_figure` is a problem.
+    """
+    problems = {}
+    for filename in sorted(os.listdir(root)):
+        name, ext = os.path.splitext(filename)
+        if ext != '.py':
+            continue
+        try:
+            with open(os.path.join(root, filename), encoding='utf-8') as f:
+                source = f.read()
+        except OSError:
+            continue
+        if '\ndef build_figure(' in source:
+            problems[name] = Problem(name, filename, SWEEPS.get(name))
+    return problems
+
+
+PROBLEMS = discover_problems()
+
+_loaded = {}
+
+
+def load_problem(name):
+    """Imports a problem script by name (once per process) and returns the module."""
+    if name in _loaded:
+        return _loaded[name]
+    if name not in PROBLEMS:
+        raise KeyError(f"unknown problem {name!r}; expected one of: {', '.join(PROBLEMS)}")
+
+    # The scripts import the shared helpers (blit_manager, ...) from the project root
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    path = os.path.join(ROOT, PROBLEMS[name].path)
+    spec = importlib.util.spec_from_file_location('problem_' + name.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _loaded[name] = module
+    return module
@@ -0,0 +1,100 @@
+"""
+Vectorized analysis of many quadratics at once.
+
+    analyze_standard(a, b, c)   for y = a x^2 + b x + c
+    analyze_vertex(a, h, k)     for y = a (x - h)^2 + k
+
+Both take scalars or arrays (broadcast against each other) and return a
+QuadraticAnalysis of arrays: vertex, discriminant, real roots and y-intercept.
+Roots are computed without catastrophic cancellation: the root of larger
+magnitude comes from the quadratic formula with the sign of b, the other from
+the product of the roots (Vieta). Missing roots are NaN, and root1 <= root2.
+
+For a == 0 the "quadratic" is linear: the vertex is NaN and the single root
+-c/b (if b != 0) is reported as root1 == root2 with n_roots == 1.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+QuadraticAnalysis = namedtuple('QuadraticAnalysis', [
+    'vertex_x', 'vertex_y', 'discriminant', 'root1', 'root2', 'n_roots', 'y_intercept',
+])
+
+
+def to_standard_form(a, h, k):
+    """(a, h, k) of a(x - h)^2 + k -> (a, b, c) of ax^2 + bx + c."""
+    a, h, k = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, h, k)))
+    return a, -2 * a * h, a * h * h + k
+
+
+def to_vertex_form(a, b, c):
+    """(a, b, c) of ax^2 + bx + c -> (a, h, k) of a(x - h)^2 + k (NaN where a == 0)."""
+    a, b, c = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h = np.where(a != 0, -b / (2 * a), np.nan)
+        k = np.where(a != 0, c - b * b / (4 * a), np.nan)
+    return a, h, k
+
+
+def _ordered(r1, r2):
+    return np.fmin(r1, r2), np.fmax(r1, r2)
+
+
+def _n_roots(discriminant, has_root):
+    n = np.where(discriminant > 0, 2, np.where(discriminant == 0, 1, 0))
+    return np.where(has_root, n, 0).astype(np.int8)
+
+
+def analyze_standard(a, b, c):
+    """Vertex, discriminant, roots and y-intercept of y = a x^2 + b x + c."""
+    a, b, c = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c)))
+    quadratic = a != 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        disc = b * b - 4 * a * c
+        vertex_x = np.where(quadratic, -b / (2 * a), np.nan)
+        vertex_y = np.where(quadratic, -disc / (4 * a), np.nan)
+
+        real = quadratic & (disc >= 0)
+        q = -0.5 * (b + np.copysign(np.sqrt(np.where(real, disc, 0)), b))
+        big = np.where(real, q / a, np.nan)
+        # q == 0 only when b == 0 and c == 0: a double root at 0
+        small = np.where(real, np.where(q != 0, c / q, 0.0), np.nan)
+
+        # Linear case b x + c = 0
+        linear = ~quadratic & (b != 0)
+        linear_root = np.where(linear, -c / b, np.nan)
+
+    root1, root2 = _ordered(big, small)
+    root1 = np.where(linear, linear_root, root1)
+    root2 = np.where(linear, linear_root, root2)
+    n_roots = np.where(linear, 1, _n_roots(disc, quadratic)).astype(np.int8)
+    disc = np.where(quadratic, disc, np.nan)
+
+    return QuadraticAnalysis(vertex_x, vertex_y, disc, root1, root2, n_roots, c.copy())
+
+
+def analyze_vertex(a, h, k):
+    """Vertex, discriminant, roots and y-intercept of y = a (x - h)^2 + k."""
+    a, h, k = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, h, k)))
+    quadratic = a != 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # b^2 - 4ac with b = -2ah, c = ah^2 + k
+        disc = np.where(quadratic, -4 * a * k, np.nan)
+        ratio = np.where(quadratic, -k / a, np.nan)  # (x - h)^2 at the roots
+
+        real = quadratic & (ratio >= 0)
+        s = np.sqrt(np.where(real, ratio, 0))
+        big = np.where(real, h + np.copysign(s, h), np.nan)
+        # Product of the roots is h^2 - s^2 = h^2 + k/a
+        small = np.where(real, np.where(big != 0, (h * h - ratio) / big, 0.0), np.nan)
+
+    root1, root2 = _ordered(big, small)
+    vertex_x = np.where(quadratic, h, np.nan)
+    vertex_y = np.where(quadratic, k, np.nan)
+    y_intercept = a * h * h + k
+
+    # a == 0 degenerates to the constant k: no vertex and no isolated root
+    return QuadraticAnalysis(vertex_x, vertex_y, disc, root1, root2, _n_roots(disc, quadratic), y_intercept)
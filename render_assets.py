@@ -0,0 +1,102 @@
+"""
+Headless (Agg) renderer for the problem figures.
+
+    python render_assets.py                        # every figure at its default parameters
+    python render_assets.py t002 t004 --sweep 24   # 24 frames along each driver parameter
+    python render_assets.py --format jpg --jobs 4 --out renders
+
+Renders run on a process pool; each worker keeps the scripts it has loaded, so
+the frames of one sweep are handed out in chunks to the same worker. A figure
+that fails to load or render (e.g. a script that cannot find a font) is
+reported and skipped; the others are still written, and the exit status is 1.
+"""
+import argparse
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from problems import PROBLEMS, load_problem
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def render(task):
+    """Renders one (problem, params, path, dpi) task to an image file; returns (path, None) or (path, error)."""
+    name, params, path, dpi = task
+    _init_worker()
+    import matplotlib.pyplot as plt
+
+    try:
+        fig = load_problem(name).build_figure(**params)
+        try:
+            fig.savefig(path, dpi=dpi)
+        finally:
+            plt.close(fig)
+    except Exception:
+        return path, traceback.format_exc()
+    return path, None
+
+
+def plan(names, out_dir, fmt='png', sweep=0, dpi=100):
+    """Lists the render tasks: one per figure, or `sweep` frames along each driver parameter."""
+    tasks = []
+    for name in names:
+        problem = PROBLEMS[name]
+        if sweep and problem.sweep:
+            param, start, stop = problem.sweep
+            step = (stop - start) / max(sweep - 1, 1)
+            for i in range(sweep):
+                path = os.path.join(out_dir, f'{name}_{param}{i:03d}.{fmt}')
+                tasks.append((name, {param: start + i * step}, path, dpi))
+        else:
+            tasks.append((name, {}, os.path.join(out_dir, f'{name}.{fmt}'), dpi))
+    return tasks
+
+
+def render_all(tasks, jobs=None):
+    """Renders the tasks across `jobs` processes (all cores by default) and yields (path, error) per task."""
+    for path in {os.path.dirname(task[2]) for task in tasks}:
+        os.makedirs(path or '.', exist_ok=True)
+
+    if jobs == 1:
+        yield from map(render, tasks)
+        return
+
+    workers = jobs or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        yield from pool.map(render, tasks, chunksize=chunksize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render the problem figures headlessly.')
+    parser.add_argument('problems', nargs='*', metavar='problem',
+                        help=f"figures to render (default: all of {', '.join(PROBLEMS)})")
+    parser.add_argument('--out', default='renders', help='output directory (default: renders)')
+    parser.add_argument('--format', default='png', choices=['png', 'jpg', 'jpeg'], help='image format')
+    parser.add_argument('--sweep', type=int, default=0, metavar='N',
+                        help='render N frames along the driver parameter of each interactive figure')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: all cores)')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.problems if name not in PROBLEMS]
+    if unknown:
+        parser.error(f"unknown problem(s): {', '.join(unknown)}")
+
+    tasks = plan(args.problems or list(PROBLEMS), args.out, args.format, args.sweep, args.dpi)
+    failed = 0
+    for path, error in render_all(tasks, args.jobs):
+        if error is None:
+            print(path)
+        else:
+            failed += 1
+            print(f'failed: {path}\n{error}', file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""
+Local HTTP render service for the problem figures.
+
+    python render_server.py                          # http://127.0.0.1:8765/, one worker per core
+    python render_server.py --port 9000 --jobs 4 --cache-mb 128
+
+    GET /problems                            problems, their driver parameter and parameter domains (JSON)
+    GET /render/t004.png?e_y=1.5&dpi=120     the figure as PNG (or .svg)
+    GET /render/plot_parabola.svg?a=-2&k=3
+    GET /stats                               cache and pool counters (JSON)
+
+Figures are rendered by a pool of headless (Agg) worker processes. Each worker
+keeps the figures it has built: an interactive figure is moved with its own
+update method (as in export_animation), the parabola with set_params, and a
+figure at its default parameters is simply saved again. Only the first
+request per worker and problem pays for building a figure.
+
+Every figure is built and saved under the rcParams read from matplotlibrc,
+with fixed SVG element ids and no SVG date, so a request's bytes do not depend
+on what a problem script changed at import or on what the worker did before.
+
+Parameters are checked against problems.DOMAINS before a request reaches the
+pool. Finished responses are kept in an LRU cache keyed by a hash of (problem,
+format, dpi, parameters); the hash is also the ETag, and HEAD answers with the
+headers alone. Concurrent requests for the same hash share a single render.
+The server listens on 127.0.0.1 only.
+"""
+import argparse
+import hashlib
+import inspect
+import io
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from export_animation import ANIMATIONS
+from problems import DOMAINS, PROBLEMS, load_problem
+from sprite_text import clear_sprites
+
+HOST = '127.0.0.1'
+FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+DPI_RANGE = (20, 400)
+
+
+class RenderError(ValueError):
+    """A request that cannot be rendered as asked (answered with 400)."""
+
+
+def check_params(name, params):
+    """Rejects parameters that `name` does not take, and values outside their domain."""
+    domains = DOMAINS.get(name, {})
+    unknown = sorted(set(params) - set(domains))
+    if unknown:
+        expected = ', '.join(domains) or 'none'
+        raise RenderError(f"{name} does not take {', '.join(unknown)} (parameters: {expected})")
+    for param, value in params.items():
+        low, high, closed = domains[param]
+        inside = low <= value <= high if closed else low < value < high
+        if not math.isfinite(value) or not inside:
+            bounds = f'[{low:g}, {high:g}]' if closed else f'({low:g}, {high:g})'
+            raise RenderError(f'{param} must be a number in {bounds}, not {value!r}')
+
+
+def request_hash(name, fmt, dpi, params):
+    """Stable hash of a render request; equal requests render identical bytes."""
+    canonical = json.dumps([name, fmt, dpi, sorted((k, float(v)) for k, v in params.items())])
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+# --- Worker processes ---
+
+_figures = {}  # per worker: (problem, 'default' | 'driven') -> figure or (plot, update method)
+_rc_baseline = None  # per worker: rcParams as read from matplotlibrc, whatever was changed at runtime
+
+# Fixed SVG element ids (instead of random ones) and no creation date, so equal requests give equal bytes
+RENDER_RC = {'svg.hashsalt': 'math-project'}
+SAVE_METADATA = {'svg': {'Date': None}, 'png': {}}
+
+
+def _init_worker():
+    global _rc_baseline
+    import matplotlib
+    matplotlib.use('Agg')
+    if _rc_baseline is None:
+        _rc_baseline = {key: value for key, value in matplotlib.rc_params().items() if key != 'backend'}
+        _rc_baseline.update(RENDER_RC)
+
+
+def _quiet(fig):
+    # Warm figures are only ever drawn by savefig; skip the redraws their update methods request
+    fig.canvas.draw_idle = lambda *args, **kwargs: None
+    return fig
+
+
+def _warm_figure(name, params):
+    """The worker's figure for `name`, moved to `params` (already checked by check_params)."""
+    module = load_problem(name)
+    if not params:
+        if (name, 'default') not in _figures:
+            _figures[name, 'default'] = _quiet(module.build_figure())
+        return _figures[name, 'default']
+
+    if (name, 'driven') not in _figures:
+        if name in ANIMATIONS:
+            cls, method = ANIMATIONS[name]
+            plot = getattr(module, cls)(blit=False, fps=None)
+            _figures[name, 'driven'] = (plot, getattr(plot, method))
+        elif hasattr(module, 'InteractiveParabola'):
+            plot = module.InteractiveParabola()
+            _figures[name, 'driven'] = (plot, lambda values: plot.set_params(**values))
+        else:
+            raise RenderError(f'{name} is a static figure and takes no parameters')
+        _quiet(plot.fig)
+
+    plot, update = _figures[name, 'driven']
+    if name in ANIMATIONS:
+        update(params[PROBLEMS[name].sweep[0]])
+    else:
+        signature = inspect.signature(module.build_figure).parameters
+        update({param: params.get(param, signature[param].default) for param in DOMAINS[name]})
+    return plot.fig
+
+
+def render_figure(name, fmt, dpi, params):
+    """Worker task: the figure of `name` at `params`, encoded as `fmt`."""
+    import matplotlib
+    _init_worker()
+    # Build and save from the same rcParams every time: whatever a problem script or an
+    # earlier request changed globally is undone here and does not reach the bytes
+    with matplotlib.rc_context(_rc_baseline):
+        fig = _warm_figure(name, params)
+        # Labels are drawn directly rather than from sprites snapped to whole pixels,
+        # so the bytes for a request do not depend on what the worker rendered before
+        clear_sprites()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=dpi, metadata=SAVE_METADATA[fmt])
+    return buffer.getvalue()
+
+
+# --- Server process ---
+
+class ResponseCache:
+    """Rendered responses by request hash, least recently used dropped beyond `budget_mb`."""
+
+    def __init__(self, budget_mb=256):
+        self.budget = int(budget_mb * 2 ** 20)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._bodies = OrderedDict()
+
+    def get(self, key):
+        body = self._bodies.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._bodies.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key, body):
+        if len(body) > self.budget or key in self._bodies:
+            return
+        self._bodies[key] = body
+        self.nbytes += len(body)
+        while self.nbytes > self.budget:
+            _, old = self._bodies.popitem(last=False)
+            self.nbytes -= len(old)
+
+    def __len__(self):
+        return len(self._bodies)
+
+
+class RenderService:
+    """The worker pool, the response cache and the in-flight table shared by the request threads."""
+
+    def __init__(self, jobs=None, cache_mb=256):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker)
+        self.cache = ResponseCache(cache_mb)
+        self.renders = 0
+        self._lock = threading.RLock()
+        self._inflight = {}  # request hash -> Future of the render
+
+    def render(self, name, fmt, dpi, params):
+        """Returns (request hash, body); blocks only the calling request thread."""
+        if name not in PROBLEMS:
+            raise KeyError(name)
+        if fmt not in FORMATS:
+            raise RenderError(f"unsupported format {fmt!r} (use {', '.join(FORMATS)})")
+        if not DPI_RANGE[0] <= dpi <= DPI_RANGE[1]:
+            raise RenderError(f'dpi must be between {DPI_RANGE[0]} and {DPI_RANGE[1]}')
+        check_params(name, params)
+        key = request_hash(name, fmt, dpi, params)
+        with self._lock:
+            body = self.cache.get(key)
+            if body is not None:
+                return key, body
+            future = self._inflight.get(key)
+            if future is None:
+                self.renders += 1
+                future = self._inflight[key] = self.pool.submit(render_figure, name, fmt, dpi, params)
+                future.add_done_callback(lambda done: self._finish(key, done))
+        return key, future.result()
+
+    def _finish(self, key, future):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if future.exception() is None:
+                self.cache.put(key, future.result())
+
+    def stats(self):
+        with self._lock:
+            return {'workers': self.jobs, 'renders': self.renders, 'in_flight': len(self._inflight),
+                    'cache': {'entries': len(self.cache), 'bytes': self.cache.nbytes,
+                              'hits': self.cache.hits, 'misses': self.cache.misses}}
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = 'math-project-render/1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        service = self.server.service
+        if url.path == '/problems':
+            return self._send_json({name: {'sweep': problem.sweep,
+                                           'domains': {param: domain._asdict() for param, domain in DOMAINS.get(name, {}).items()}}
+                                    for name, problem in PROBLEMS.items()})
+        if url.path == '/stats':
+            return self._send_json(service.stats())
+        if not url.path.startswith('/render/'):
+            return self.send_error(404, 'use /render/<problem>.<png|svg>, /problems or /stats')
+
+        name, _, fmt = url.path[len('/render/'):].rpartition('.')
+        try:
+            query = dict(parse_qsl(url.query, strict_parsing=bool(url.query)))
+            dpi = int(query.pop('dpi', 100))
+            params = {param: float(value) for param, value in query.items()}
+            key, body = service.render(name, fmt, dpi, params)
+        except KeyError:
+            return self.send_error(404, f'unknown problem {name!r}')
+        except (RenderError, ValueError) as error:
+            return self.send_error(400, str(error))
+        except Exception as error:
+            self.log_error('render failed: %r', error)
+            return self.send_error(500, 'render failed')
+
+        etag = f'"{key}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            return self.end_headers()
+        self._send(body, FORMATS[fmt], etag)
+
+    # HEAD gets the same status and headers (Content-Length, ETag) without the body
+    do_HEAD = do_GET
+
+    def _send_json(self, data):
+        self._send(json.dumps(data, indent=2).encode(), 'application/json')
+
+    def _send(self, body, content_type, etag=None):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'max-age=86400')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+
+def make_server(service, port=8765):
+    """An HTTP server on 127.0.0.1:`port` (0 picks a free port) answering from `service`."""
+    server = ThreadingHTTPServer((HOST, port), RenderHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the problem figures as PNG/SVG on localhost.')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--jobs', type=int, default=None, help='render worker processes (default: all cores)')
+    parser.add_argument('--cache-mb', type=float, default=256, help='response cache size (default 256 MiB)')
+    args = parser.parse_args(argv)
+
+    service = RenderService(args.jobs, args.cache_mb)
+    server = make_server(service, args.port)
+    print(f'serving on http://{HOST}:{server.server_address[1]}/ with {service.jobs} worker(s)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import numpy as np
+
+
+def find_roots(f, x, xtol=1e-14, maxiter=200, fprime=None):
+    """
+    Finds every root of a vectorized function `f` on the sample grid `x`.
+
+    `f` is evaluated on the whole grid at once. Every sign change between
+    neighbouring samples is then refined by bisection, with all brackets
+    advanced together in one array. Grid points where `f` is exactly zero are
+    roots as well. NaN values (outside the domain) never form a bracket.
+    With the derivative `fprime`, every bisected root is polished by one final
+    Newton step, kept only if it stays inside its bracket and does not
+    increase |f|. Returns the sorted roots.
+    """
+    x = np.asarray(x, dtype=float)
+    fx = f(x)
+
+    exact = x[fx == 0]
+    brackets = np.nonzero(np.sign(fx[:-1]) * np.sign(fx[1:]) < 0)[0]
+    lo, hi = x[brackets], x[brackets + 1]
+    f_lo = fx[brackets]
+
+    for _ in range(maxiter):
+        if lo.size == 0 or np.all(hi - lo <= xtol * (1 + np.abs(lo))):
+            break
+        mid = 0.5 * (lo + hi)
+        f_mid = f(mid)
+        left = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(left, mid, lo)
+        f_lo = np.where(left, f_mid, f_lo)
+        hi = np.where(left, hi, mid)
+
+    roots = 0.5 * (lo + hi)
+    if fprime is not None and roots.size:
+        f_root = f(roots)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            polished = roots - f_root / fprime(roots)
+        better = (polished >= lo) & (polished <= hi) & (np.abs(f(polished)) <= np.abs(f_root))
+        roots = np.where(better, polished, roots)
+    return np.sort(np.concatenate([exact, roots]))
@@ -0,0 +1,110 @@
+"""
+Text labels that are laid out once and then only moved.
+
+Laying out and rasterizing a text (glyph metrics, the bbox patch, blending
+every glyph) happens on every draw of a plain matplotlib Text, even when only
+its position changed. A SpriteText renders itself once per distinct look into
+a small RGBA sprite, cached by its string and style, and every later Agg draw
+just blits that sprite at the current anchor, snapped to a whole pixel.
+Changing the string or the style picks (or renders) another sprite; moving the
+label never re-renders. A string drawn only once (a readout whose value changes
+on every frame) is drawn directly and never pays for a sprite.
+
+Non-Agg renderers (SVG, PDF, ...) draw the text as usual, so exported vector
+files keep real text.
+
+    label = add_text(ax, x, y, 'P', fontsize=14, color='blue', ha='center')
+    label.set_position((x2, y2))   # the next draw only translates the sprite
+"""
+import math
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.backends.backend_agg import RendererAgg
+from matplotlib.colors import to_rgba
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox, IdentityTransform
+
+_sprites = OrderedDict()  # (string, style, dpi) -> (RGBA rows bottom-up, x offset, y offset), None if seen once
+MAX_SPRITES = 512
+PAD = 2  # pixels around the text extent, for antialiased edges
+
+
+def clear_sprites():
+    _sprites.clear()
+
+
+class SpriteText(Text):
+    """A Text whose Agg rendering is cached as a sprite and translated on later draws."""
+
+    def _style_key(self):
+        """Everything besides the position that changes how the text looks."""
+        patch = self.get_bbox_patch()
+        box = None if patch is None else (
+            str(patch.get_boxstyle()), patch.get_facecolor(), patch.get_edgecolor(), patch.get_linewidth(),
+            patch.get_linestyle(), patch.get_alpha())
+        return (self.get_fontproperties(), to_rgba(self.get_color()), self.get_alpha(), self.get_rotation(),
+                self.get_horizontalalignment(), self.get_verticalalignment(), self._get_multialignment(),
+                self.get_linespacing(), self.get_rotation_mode(), self.get_usetex(), box)
+
+    def _render_sprite(self, renderer, anchor):
+        """Draws the text into its own small Agg buffer, anchored at an integer pixel."""
+        extent = self.get_window_extent(renderer)
+        patch = self.get_bbox_patch()
+        if patch is not None:
+            self.update_bbox_position_size(renderer)
+            extent = Bbox.union([extent, patch.get_window_extent(renderer)])
+        x0 = math.floor(extent.x0 - anchor[0]) - PAD
+        y0 = math.floor(extent.y0 - anchor[1]) - PAD
+        width = math.ceil(extent.x1 - anchor[0]) + PAD - x0
+        height = math.ceil(extent.y1 - anchor[1]) + PAD - y0
+
+        buffer = RendererAgg(width, height, renderer.dpi)
+        position, transform, clip = self.get_position(), self.get_transform(), self.get_clip_on()
+        try:
+            self.set_transform(IdentityTransform())
+            self.set_position((-x0, -y0))
+            self.set_clip_on(False)
+            super().draw(buffer)
+        finally:
+            self.set_transform(transform)
+            self.set_position(position)
+            self.set_clip_on(clip)
+        # draw_image takes the rows bottom-up
+        return np.asarray(buffer.buffer_rgba())[::-1].copy(), x0, y0
+
+    def draw(self, renderer):
+        if not isinstance(renderer, RendererAgg) or not self.get_visible() or self.get_text() == '':
+            return super().draw(renderer)
+        anchor = self.get_transform().transform(self.get_unitless_position())
+        if not np.isfinite(anchor).all():
+            return
+        anchor = np.round(anchor)
+
+        # A sprite is only worth rendering for a look that is drawn more than once:
+        # the first draw of a new string goes straight to the canvas and is remembered
+        key = (self.get_text(), self._style_key(), renderer.dpi)
+        if key not in _sprites:
+            _sprites[key] = None
+            if len(_sprites) > MAX_SPRITES:
+                _sprites.popitem(last=False)
+            return super().draw(renderer)
+        _sprites.move_to_end(key)
+        if _sprites[key] is None:
+            _sprites[key] = self._render_sprite(renderer, anchor)
+        image, x0, y0 = _sprites[key]
+
+        renderer.open_group('text', self.get_gid())
+        gc = renderer.new_gc()
+        self._set_gc_clip(gc)
+        renderer.draw_image(gc, anchor[0] + x0, anchor[1] + y0, image)
+        gc.restore()
+        renderer.close_group('text')
+        self.stale = False
+
+
+def add_text(ax, x, y, s, **kwargs):
+    """Like ax.text, but the label is a SpriteText."""
+    text = SpriteText(x, y, s, **dict(dict(clip_on=False, transform=ax.transData), **kwargs))
+    ax.add_artist(text)
+    return text
@@ -0,0 +1,92 @@
+"""
+Batched drawing of static geometry diagrams.
+
+A StaticScene collects labelled points, segments, polylines and angle arcs and
+draws them with a few collections instead of one artist per element:
+segments and arcs sharing a style go into one LineCollection, points sharing
+a style into one PathCollection (scatter). All arc polylines are generated in
+a single vectorized step. Labels stay Text artists.
+
+    scene = StaticScene()
+    scene.polyline([A, B, C, A], color='k', label='Triangle ABC')
+    scene.segment(A, P, color='r', linestyle='--')
+    scene.points({'A': A, 'B': B}, label_offset=(0, 0.2), fontsize=14, ha='center')
+    scene.arc(E, P, B, 0.8, '58°')
+    scene.draw(ax)
+"""
+import numpy as np
+from matplotlib.collections import LineCollection
+
+ARC_SAMPLES = 64
+
+
+class StaticScene:
+    def __init__(self):
+        self._lines = {}  # style -> list of (M, 2) polylines
+        self._points = {}  # style -> list of (x, y)
+        self._labels = []  # (x, y, text, text kwargs)
+        self._arcs = []  # (center, p1, p2, radius, style)
+        self._arc_labels = []  # (text, offset, text kwargs), parallel to _arcs
+
+    # --- Elements ---
+
+    def polyline(self, points, color='k', linestyle='-', linewidth=1.5, label=None):
+        style = (color, linestyle, linewidth, label)
+        self._lines.setdefault(style, []).append(np.asarray(points, dtype=float))
+
+    def segment(self, p, q, **style):
+        self.polyline([p, q], **style)
+
+    def points(self, named_points, color='k', size=6, label_offset=(0.2, 0.2), **text_kw):
+        """Marks each point of {name: (x, y)} and writes its name at `label_offset`."""
+        dx, dy = label_offset
+        for name, (x, y) in named_points.items():
+            self._points.setdefault((color, size), []).append((x, y))
+            self.text(x + dx, y + dy, name, **text_kw)
+
+    def text(self, x, y, text, **text_kw):
+        self._labels.append((x, y, text, text_kw))
+
+    def arc(self, center, p1, p2, radius, text=None, text_offset=0.5, color='red', linewidth=1, **text_kw):
+        """Counter-clockwise arc around `center` from the direction of p1 to that of p2, with its label."""
+        self._arcs.append((center, p1, p2, radius, (color, '-', linewidth, None)))
+        self._arc_labels.append((text, text_offset, dict(dict(color=color, fontsize=10, ha='center', va='center'), **text_kw)))
+
+    # --- Drawing ---
+
+    def _arc_paths(self):
+        """All arcs as (K, ARC_SAMPLES, 2) polylines, plus their mid-angles; computed in one go."""
+        center, p1, p2 = (np.array([arc[i] for arc in self._arcs], dtype=float) for i in range(3))
+        radius = np.array([arc[3] for arc in self._arcs], dtype=float)
+        v1, v2 = p1 - center, p2 - center
+        start = np.arctan2(v1[:, 1], v1[:, 0])
+        stop = np.arctan2(v2[:, 1], v2[:, 0])
+        stop = stop + 2 * np.pi * (stop < start)
+        theta = start[:, None] + (stop - start)[:, None] * np.linspace(0, 1, ARC_SAMPLES)
+        paths = center[:, None, :] + radius[:, None, None] * np.stack([np.cos(theta), np.sin(theta)], axis=-1)
+        return center, radius, paths, (start + stop) / 2
+
+    def draw(self, ax, zorder=2):
+        """Adds the collected elements to `ax`; returns the created artists."""
+        lines = {style: list(paths) for style, paths in self._lines.items()}
+        labels = list(self._labels)
+        if self._arcs:
+            center, radius, paths, mid = self._arc_paths()
+            for arc, path in zip(self._arcs, paths):
+                lines.setdefault(arc[4], []).append(path)
+            for (text, offset, text_kw), c, r, angle in zip(self._arc_labels, center, radius, mid):
+                if text is not None:
+                    labels.append((c[0] + (r + offset) * np.cos(angle), c[1] + (r + offset) * np.sin(angle), text, text_kw))
+
+        artists = []
+        for (color, linestyle, linewidth, label), paths in lines.items():
+            collection = LineCollection(paths, colors=color, linestyles=linestyle, linewidths=linewidth,
+                                        label=label, zorder=zorder)
+            artists.append(ax.add_collection(collection, autolim=True))
+        for (color, size), xy in self._points.items():
+            x, y = np.array(xy, dtype=float).T
+            artists.append(ax.scatter(x, y, s=size ** 2, c=color, zorder=zorder + 1))
+        for x, y, text, text_kw in labels:
+            artists.append(ax.text(x, y, text, **text_kw))
+        ax.autoscale_view()
+        return artists
@@ -1,24 +1,19 @@
+import functools
+
 import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
 from matplotlib.patches import Polygon
 
-# --- 字体设置函数 ---
-def set_chinese_font():
-    """
-    自动查找并设置可用的中文字体。
-    """
-    font_names = ['Heiti TC', 'Arial Unicode MS', 'STHeiti', 'SimHei']
-    found_font = next((name for name in font_names if fm.findfont(name, fallback_to_default=False)), None)
-    if found_font:
-        print(f"找到可用中文字体: {found_font}")
-        plt.rcParams['font.sans-serif'] = [found_font]
-    else:
-        print("警告: 未找到指定的中文字体。图例和标题可能显示为方框。")
-    plt.rcParams['axes.unicode_minus'] = False
-
-# --- 调用字体设置 ---
-set_chinese_font()
+from blit_manager import BlitManager
+from cjk_font import chinese_font_rc
+from frame_cache import FrameCache
+from frame_scheduler import FrameScheduler
+from hit_index import HandleIndex
+from root_finding import find_roots
+from sprite_text import add_text
+
+# --- 中文字体: 只用于本脚本创建的图形, 不修改全局设置 ---
+CJK_RC = chinese_font_rc()
 
 # 1. --- 初始几何设置 ---
 C = np.array([0, 0])
@@ -26,125 +21,226 @@ A = np.array([4, 0])
 B = np.array([0, 4])
 N = np.array([0, -4]) # N点是固定的
 m_initial = 6.0
+M_MIN = 4.01  # 拖动时 M 的下限 (M 不与 A 重合)
 
-# 2. --- 创建图形和坐标轴 ---
-fig, ax = plt.subplots(figsize=(10, 10)) # 稍微调整画布大小
-plt.subplots_adjust(top=0.88, bottom=0.1) # 调整顶部和底部边距
-
-# --- 添加问题描述 ---
 problem_text = (
     '如图2, 点M为线段CA延长线上一点, 过点A作AQ⊥AB, 过点M作BM的垂线交AQ于点P,\n'
     '线段PA的延长线与线段BC的延长线交于点N, 是否存在点M, 使S△AMP = (3/2)S△AMN,\n'
     '若存在, 求CM的长; 若不存在, 请说明理由.'
 )
-fig.suptitle(problem_text, fontsize=13, y=0.97, va='top')
-
-ax.set_aspect('equal', adjustable='box')
-ax.grid(True, linestyle='--')
-# ax.set_title("问题 (2) 的动态几何演示 (可拖动M点)", fontsize=16) # 由 suptitle 代替
-ax.set_xlabel("X轴")
-ax.set_ylabel("Y轴")
-ax.set_xlim(-5, 15)
-ax.set_ylim(-5, 15)
-
-# 3. --- 绘制静态元素和标签 ---
-ax.plot(A[0], A[1], 'ko', markersize=8, label='点 A')
-ax.text(A[0] + 0.2, A[1] + 0.2, 'A', fontsize=14, color='black', va='bottom')
-ax.plot(B[0], B[1], 'ko', markersize=8, label='点 B')
-ax.text(B[0] + 0.2, B[1] + 0.2, 'B', fontsize=14, color='black', va='bottom')
-ax.plot(C[0], C[1], 'ko', markersize=8, label='点 C')
-ax.text(C[0] - 0.5, C[1] - 0.2, 'C', fontsize=14, color='black', va='top', ha='right')
-ax.plot(N[0], N[1], 'go', markersize=8, label='点 N')
-ax.text(N[0] + 0.2, N[1], 'N', fontsize=14, color='green', va='center')
-
-ax.plot([A[0], B[0], C[0], A[0]], [A[1], B[1], C[1], A[1]], 'k-', label='△ABC')
-ax.plot([C[0], N[0]], [C[1], N[1]], 'g--', lw=1.5, label='线段 CN')
-ax.plot([A[0], N[0]], [A[1], N[1]], 'g--', lw=1.5, label='线段 AN')
-ax.axhline(0, color='gray', linestyle='--', lw=0.5)
-ax.axvline(0, color='gray', linestyle='--', lw=0.5)
-
-# 4. --- 绘制动态元素 (初始化) ---
-M_init = np.array([m_initial, 0])
-P_init = np.array([m_initial + 4, m_initial])
-
-poly_pam = Polygon([A, M_init, P_init], facecolor='cyan', alpha=0.4, zorder=0)
-poly_amn = Polygon([A, M_init, N], facecolor='yellow', alpha=0.4, zorder=0)
-ax.add_patch(poly_pam)
-ax.add_patch(poly_amn)
-
-point_m_plot, = ax.plot(M_init[0], M_init[1], 'ro', markersize=10, label='动点 M (可拖动)')
-point_p_plot, = ax.plot(P_init[0], P_init[1], 'bo', markersize=8, label='动点 P')
-line_bm_plot, = ax.plot([B[0], M_init[0]], [B[1], M_init[1]], 'r--', label='线段 BM')
-line_mp_plot, = ax.plot([M_init[0], P_init[0]], [M_init[1], P_init[1]], 'b--', label='线段 MP (⊥BM)')
-line_aq_plot, = ax.plot([N[0], P_init[0]], [N[1], P_init[1]], 'g-', label='直线 NP')
-line_mn_plot, = ax.plot([M_init[0], N[0]], [M_init[1], N[1]], 'y--', lw=1.5, label='线段 MN')
-
-# 动态标签
-label_m = ax.text(M_init[0], M_init[1] - 0.8, 'M', fontsize=14, color='red', ha='center')
-label_p = ax.text(P_init[0], P_init[1] + 0.3, 'P', fontsize=14, color='blue', ha='center')
-
-area_text = ax.text(0.05, 0.95, '', transform=ax.transAxes, verticalalignment='top', fontsize=12,
-                    bbox=dict(boxstyle='round,pad=0.5', fc='wheat', alpha=0.7))
-
-# 5. --- 核心更新逻辑 ---
-def update_geometry(m_new):
-    m_new = max(4.01, m_new)
-    M_new = np.array([m_new, 0])
-    P_new = np.array([m_new + 4, m_new])
-    
-    point_m_plot.set_data([M_new[0]], [M_new[1]])
-    point_p_plot.set_data([P_new[0]], [P_new[1]])
-    
-    line_bm_plot.set_data([B[0], M_new[0]], [B[1], M_new[1]])
-    line_mp_plot.set_data([M_new[0], P_new[0]], [M_new[1], P_new[1]])
-    line_aq_plot.set_data([N[0], P_new[0]], [N[1], P_new[1]])
-    line_mn_plot.set_data([M_new[0], N[0]], [M_new[1], N[1]])
-    
-    poly_pam.set_xy(np.array([A, M_new, P_new]))
-    poly_amn.set_xy(np.array([A, M_new, N]))
-    
-    label_m.set_position((M_new[0], M_new[1] - 0.8))
-    label_p.set_position((P_new[0], P_new[1] + 0.3))
-    
-    s_amp = 0.5 * (m_new - 4) * m_new
-    s_amn = 0.5 * (m_new - 4) * 4
-    ratio = s_amp / s_amn if s_amn != 0 else 0
-    text_content = (f"CM = {m_new:.2f}\nS△PAM = {s_amp:.2f}\nS△AMN = {s_amn:.2f}\n比值 = {ratio:.2f}")
-    area_text.set_text(text_content)
-    
-    if np.isclose(ratio, 1.5, atol=0.01):
-        area_text.set_bbox(dict(boxstyle='round,pad=0.5', fc='lightgreen', alpha=0.8))
-    else:
-        area_text.set_bbox(dict(boxstyle='round,pad=0.5', fc='wheat', alpha=0.7))
-        
-    fig.canvas.draw_idle()
+
+# --- 面积与求解 ---
+def triangle_areas(m):
+    """CM = m 时的 S△AMP 与 S△AMN (m 可以是数组)。"""
+    return 0.5 * (m - 4) * m, 0.5 * (m - 4) * 4
+
+@functools.lru_cache(maxsize=None)
+def solve_cm(target_ratio=1.5, samples=100001):
+    """
+    求所有满足 S△AMP = target_ratio · S△AMN 的 CM (m > 4)。
+    先在整个 m ≥ 4 的范围上做向量化扫描 (m = 4 + tan(πu/2), 0 ≤ u < 1),
+    再用二分法细化每一个变号区间, 最后各做一步牛顿迭代。结果按目标比值缓存。
+    """
+    u = np.linspace(0, 1, samples)[:-1]
+    m = 4 + np.tan(0.5 * np.pi * u)
+
+    def ratio_error(m):
+        s_amp, s_amn = triangle_areas(m)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = s_amp / s_amn
+        # m = 4 时两面积都为 0, 比值取极限 m/4 = 1 (约去公共因子 m - 4),
+        # 所以扫描从 m = 4 本身开始, 紧挨 m = 4 的根也落在变号区间里
+        return np.where(m == 4, 1.0, ratio) - target_ratio
+
+    def ratio_slope(m):
+        # 比值 = m(m-4) / 4(m-4) = m/4
+        return np.full_like(m, 0.25)
+
+    roots = find_roots(ratio_error, m, fprime=ratio_slope)
+    return tuple(float(root) for root in roots if root > 4)
+
+class InteractiveExistence:
+    @plt.rc_context(CJK_RC)
+    def __init__(self, blit=True, fps=60, show_solutions=True, cache_mb=0, cache_step=0.025):
+        self.show_solutions = show_solutions
+        # 2. --- 创建图形和坐标轴 ---
+        self.fig, self.ax = plt.subplots(figsize=(10, 10)) # 稍微调整画布大小
+        self.fig.subplots_adjust(top=0.88, bottom=0.1) # 调整顶部和底部边距
+
+        self.init_plot()
+
+        # 可选: 按 (量化后的) M 位置缓存已渲染的画面
+        self.frames = FrameCache(cache_step, cache_mb) if cache_mb else None
+        # 只重绘动态元素, 静态背景缓存一次
+        self.blitter = BlitManager(self.fig.canvas, [
+            self.poly_pam, self.poly_amn, self.point_m_plot, self.point_p_plot,
+            self.line_bm_plot, self.line_mp_plot, self.line_aq_plot, self.line_mn_plot,
+            self.label_m, self.label_p, self.area_text,
+        ], enabled=blit, cache=self.frames)
+
+        # --- 实例化拖动器, 初始化 ---
+        self.dragger = PointDragger(self.point_m_plot, self.update_geometry, fps=fps)
+        self.update_geometry(m_initial)
+        self.ax.legend(loc='upper right', fontsize='small')
+
+    def init_plot(self):
+        fig, ax = self.fig, self.ax
+
+        # --- 添加问题描述 ---
+        fig.suptitle(problem_text, fontsize=13, y=0.97, va='top')
+
+        ax.set_aspect('equal', adjustable='box')
+        ax.grid(True, linestyle='--')
+        # ax.set_title("问题 (2) 的动态几何演示 (可拖动M点)", fontsize=16) # 由 suptitle 代替
+        ax.set_xlabel("X轴")
+        ax.set_ylabel("Y轴")
+        ax.set_xlim(-5, 15)
+        ax.set_ylim(-5, 15)
+
+        # 3. --- 绘制静态元素和标签 ---
+        ax.plot(A[0], A[1], 'ko', markersize=8, label='点 A')
+        ax.text(A[0] + 0.2, A[1] + 0.2, 'A', fontsize=14, color='black', va='bottom')
+        ax.plot(B[0], B[1], 'ko', markersize=8, label='点 B')
+        ax.text(B[0] + 0.2, B[1] + 0.2, 'B', fontsize=14, color='black', va='bottom')
+        ax.plot(C[0], C[1], 'ko', markersize=8, label='点 C')
+        ax.text(C[0] - 0.5, C[1] - 0.2, 'C', fontsize=14, color='black', va='top', ha='right')
+        ax.plot(N[0], N[1], 'go', markersize=8, label='点 N')
+        ax.text(N[0] + 0.2, N[1], 'N', fontsize=14, color='green', va='center')
+
+        ax.plot([A[0], B[0], C[0], A[0]], [A[1], B[1], C[1], A[1]], 'k-', label='△ABC')
+        ax.plot([C[0], N[0]], [C[1], N[1]], 'g--', lw=1.5, label='线段 CN')
+        ax.plot([A[0], N[0]], [A[1], N[1]], 'g--', lw=1.5, label='线段 AN')
+        ax.axhline(0, color='gray', linestyle='--', lw=0.5)
+        ax.axvline(0, color='gray', linestyle='--', lw=0.5)
+
+        # 4. --- 绘制动态元素 (初始化) ---
+        M_init = np.array([m_initial, 0])
+        P_init = np.array([m_initial + 4, m_initial])
+
+        # 三角形顶点放在预分配的闭合缓冲区里 (末点 = 首点), 拖动时原地改写 M, P 两行
+        self.pam_xy = np.array([A, M_init, P_init, A], dtype=float)
+        self.amn_xy = np.array([A, M_init, N, A], dtype=float)
+        self.poly_pam = Polygon(self.pam_xy, facecolor='cyan', alpha=0.4, zorder=0)
+        self.poly_amn = Polygon(self.amn_xy, facecolor='yellow', alpha=0.4, zorder=0)
+        ax.add_patch(self.poly_pam)
+        ax.add_patch(self.poly_amn)
+
+        self.point_m_plot, = ax.plot(M_init[0], M_init[1], 'ro', markersize=10, label='动点 M (可拖动)')
+        self.point_p_plot, = ax.plot(P_init[0], P_init[1], 'bo', markersize=8, label='动点 P')
+        self.line_bm_plot, = ax.plot([B[0], M_init[0]], [B[1], M_init[1]], 'r--', label='线段 BM')
+        self.line_mp_plot, = ax.plot([M_init[0], P_init[0]], [M_init[1], P_init[1]], 'b--', label='线段 MP (⊥BM)')
+        self.line_aq_plot, = ax.plot([N[0], P_init[0]], [N[1], P_init[1]], 'g-', label='直线 NP')
+        self.line_mn_plot, = ax.plot([M_init[0], N[0]], [M_init[1], N[1]], 'y--', lw=1.5, label='线段 MN')
+
+        # 动态标签: 每种文字只排版一次, 移动时只平移缓存的图像
+        self.label_m = add_text(ax, M_init[0], M_init[1] - 0.8, 'M', fontsize=14, color='red', ha='center')
+        self.label_p = add_text(ax, P_init[0], P_init[1] + 0.3, 'P', fontsize=14, color='blue', ha='center')
+
+        self.area_text = add_text(ax, 0.05, 0.95, '', transform=ax.transAxes, verticalalignment='top', fontsize=12,
+                                  bbox=dict(boxstyle='round,pad=0.5', fc='wheat', alpha=0.7))
+        self.area_solved = False
+
+        # 求解模式: 直接标出所有满足条件的 M 点
+        if self.show_solutions:
+            solutions = solve_cm(1.5)
+            label = ', '.join(f'{m:.2f}' for m in solutions) if solutions else '无'
+            ax.plot(solutions, [0] * len(solutions), 'g*', markersize=16, zorder=5,
+                    label=f'满足条件的 M: CM = {label}')
+
+    # 5. --- 核心更新逻辑 ---
+    def update_geometry(self, m_new):
+        # 单点的交互路径只用标量计算, 不创建临时的 numpy 数组
+        # 先限制在 M 的范围内再量化; 量化落到下限以下时取上一个格点
+        m_new = max(M_MIN, float(m_new))
+        key = None
+        if self.frames is not None:
+            key, m_new = self.frames.quantize(m_new)
+            if m_new < M_MIN:
+                key, m_new = self.frames.quantize(m_new + self.frames.step)
+        p_x, p_y = m_new + 4, m_new  # M = (m, 0), P = (m + 4, m)
+
+        self.point_m_plot.set_data([m_new], [0.0])
+        self.dragger.handles.moved(self.point_m_plot)
+        self.point_p_plot.set_data([p_x], [p_y])
+
+        self.line_bm_plot.set_data([B[0], m_new], [B[1], 0.0])
+        self.line_mp_plot.set_data([m_new, p_x], [0.0, p_y])
+        self.line_aq_plot.set_data([N[0], p_x], [N[1], p_y])
+        self.line_mn_plot.set_data([m_new, N[0]], [0.0, N[1]])
+
+        self.pam_xy[1] = m_new, 0.0
+        self.pam_xy[2] = p_x, p_y
+        self.amn_xy[1] = m_new, 0.0
+        self.poly_pam.set_xy(self.pam_xy)
+        self.poly_amn.set_xy(self.amn_xy)
+
+        self.label_m.set_position((m_new, -0.8))
+        self.label_p.set_position((p_x, p_y + 0.3))
+
+        s_amp, s_amn = triangle_areas(m_new)
+        ratio = s_amp / s_amn if s_amn != 0 else 0
+        text_content = (f"CM = {m_new:.2f}\nS△PAM = {s_amp:.2f}\nS△AMN = {s_amn:.2f}\n比值 = {ratio:.2f}")
+        # 内容不变时 set_text 不做任何事; 底框只在状态切换时替换
+        self.area_text.set_text(text_content)
+
+        solved = abs(ratio - 1.5) <= 0.01
+        if solved != self.area_solved:
+            self.area_solved = solved
+            if solved:
+                self.area_text.set_bbox(dict(boxstyle='round,pad=0.5', fc='lightgreen', alpha=0.8))
+            else:
+                self.area_text.set_bbox(dict(boxstyle='round,pad=0.5', fc='wheat', alpha=0.7))
+
+        self.blitter.update(key)
+
+    def show(self):
+        plt.show()
 
 # 6. --- 实现M点拖动功能 ---
 class PointDragger:
-    def __init__(self, point_to_drag):
+    def __init__(self, point_to_drag, on_drag, fps=60):
         self.point = point_to_drag
         self.is_dragging = False
         self.press_data = None
-        fig.canvas.mpl_connect('button_press_event', self.on_press)
-        fig.canvas.mpl_connect('motion_notify_event', self.on_motion)
-        fig.canvas.mpl_connect('button_release_event', self.on_release)
+        canvas = point_to_drag.figure.canvas
+        # 在显示坐标中建立可拖动点的索引, 用于快速判断点击位置
+        self.handles = HandleIndex(point_to_drag.axes)
+        self.handles.add(point_to_drag)
+        # 合并高频的鼠标移动事件, 每帧最多更新一次
+        self.scheduler = FrameScheduler(canvas, on_drag, fps=fps)
+        canvas.mpl_connect('button_press_event', self.on_press)
+        canvas.mpl_connect('motion_notify_event', self.on_motion)
+        canvas.mpl_connect('button_release_event', self.on_release)
 
     def on_press(self, event):
-        if event.inaxes != self.point.axes or not self.point.contains(event)[0]: return
+        if self.handles.find(event) is not self.point: return
         self.press_data = self.point.get_xdata()[0], event.xdata
         self.is_dragging = True
 
     def on_motion(self, event):
         if not self.is_dragging or event.inaxes != self.point.axes: return
         x0, xpress = self.press_data
-        update_geometry(x0 + (event.xdata - xpress))
+        self.scheduler.submit(x0 + (event.xdata - xpress))
 
     def on_release(self, event):
+        self.scheduler.flush()
         self.is_dragging = False
         self.press_data = None
 
-# --- 实例化拖动器, 初始化并显示 ---
-dragger = PointDragger(point_m_plot)
-update_geometry(m_initial)
-ax.legend(loc='upper right', fontsize='small')
-plt.show()
\ No newline at end of file
+def build_figure(m=None):
+    """Builds the figure without showing it (for headless rendering); m sets CM."""
+    plot = InteractiveExistence(blit=False, fps=None)
+    if m is not None:
+        plot.update_geometry(m)
+    return plot.fig
+
+def main(show=True):
+    """Opens the interactive figure; with show=False it is only built and returned."""
+    plot = InteractiveExistence()
+    if show:
+        plot.show()
+    return plot
+
+# --- 显示 ---
+if __name__ == '__main__':
+    main()
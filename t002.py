@@ -2,8 +2,19 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+import batch_solvers
+from blit_manager import BlitManager
+from frame_cache import FrameCache
+from frame_scheduler import FrameScheduler
+from geometry_kernel import Scene, label, marker, merge_updates, polyline
+from geometry_worker import GeometryWorker
+from hit_index import HandleIndex
+from locus import compute_locus
+from sprite_text import add_text
+from trace_buffer import TraceBuffer
+
 class InteractiveRotation:
-    def __init__(self):
+    def __init__(self, blit=True, fps=60, locus=True, trace_capacity=2048, trace_tol=None, cache_mb=0, cache_step=0.05, threaded=False):
         self.fig, self.ax = plt.subplots(figsize=(8, 8))
         self.is_dragging = False
 
@@ -13,15 +24,38 @@ class InteractiveRotation:
         self.C = np.array([2, 2])
 
         # --- Draggable Point P and dependent Point E ---
-        self.P = np.array([-2.0, 0]) # Initial position
+        self.P = (-2.0, 0.0) # Initial position; P and E are (x, y) tuples, as the scene keeps them
         self.E = self.calculate_e(self.P)
         
-        # --- Trace of E ---
-        self.trace_x = [self.E[0]]
-        self.trace_y = [self.E[1]]
+        # --- Path of E: precomputed analytic locus, or the trace of the drag (bounded;
+        # trace_tol merges nearly collinear samples) when locus=False ---
+        self.locus = locus
+        self.trace = TraceBuffer(trace_capacity, collinear_tol=trace_tol)
+        self.trace.reset(*self.E)
 
-        # --- Initialize plot elements ---
+        # --- Initialize plot elements and the construction driving them ---
         self.init_plot()
+        if self.locus:
+            self.trace_line.set_data(*self.calculate_locus().T)
+        self.handles = HandleIndex(self.ax)
+        self.handles.add(self.point_p)
+        self.init_scene()
+
+        # --- Optional cache of rendered frames per (snapped) P position; the drag
+        # trace depends on the history, so only the static locus can be cached ---
+        if cache_mb and not locus:
+            raise ValueError("the frame cache needs locus=True")
+        self.frames = FrameCache(cache_step, cache_mb) if cache_mb else None
+        self.blitter = BlitManager(self.fig.canvas, [
+            self.line_pc, self.line_ce, self.line_ae,
+            self.point_p, self.point_e, self.text_p, self.text_e,
+        ] + ([] if self.locus else [self.trace_line]), enabled=blit, cache=self.frames)
+
+        # --- Coalesce drag events to at most one update per frame, or solve them on a worker thread ---
+        if threaded:
+            self.scheduler = GeometryWorker(self.fig.canvas, self.solve_plot, self.apply_plot, fps=fps, merge=merge_updates)
+        else:
+            self.scheduler = FrameScheduler(self.fig.canvas, self.update_plot, fps=fps)
 
         # --- Connect mouse events ---
         self.fig.canvas.mpl_connect('button_press_event', self.on_press)
@@ -29,13 +63,22 @@ class InteractiveRotation:
         self.fig.canvas.mpl_connect('button_release_event', self.on_release)
 
     def calculate_e(self, p_point):
-        """Calculates E by rotating P around C by -90 degrees (clockwise)."""
+        """Calculates E by rotating P around C by 90 degrees counter-clockwise; returns an (x, y) tuple."""
         # Vector CP
-        vec_cp = p_point - self.C
-        # Rotate vector CP 90 degrees counter-clockwise: (x, y) -> (-y, x)
-        vec_ce = np.array([-vec_cp[1], vec_cp[0]])
-        # E = C + CE
-        return self.C + vec_ce
+        cp_x, cp_y = p_point[0] - self.C[0], p_point[1] - self.C[1]
+        # Rotate vector CP 90 degrees counter-clockwise: (x, y) -> (-y, x); E = C + CE
+        return (float(self.C[0] - cp_y), float(self.C[1] + cp_x))
+
+    def calculate_e_batch(self, p_x_coords):
+        """Vectorized calculate_e for an array of P x-coordinates; returns an (N, 2) array."""
+        return batch_solvers.rotation_e(p_x_coords, self.C)
+
+    def calculate_locus(self, samples=2001):
+        """E's whole path for P anywhere on the visible part of the x-axis, computed once per configuration."""
+        lo, hi = self.ax.get_xlim()
+        key = ('t002', tuple(self.C), lo, hi, samples)
+        points, = compute_locus(key, self.calculate_e_batch, np.linspace(lo, hi, samples))
+        return points
 
     def init_plot(self):
         # --- Lines ---
@@ -43,7 +86,7 @@ class InteractiveRotation:
         self.line_pc, = self.ax.plot([self.P[0], self.C[0]], [self.P[1], self.C[1]], 'b-', label='PC')
         self.line_ce, = self.ax.plot([self.C[0], self.E[0]], [self.C[1], self.E[1]], 'r-', label='CE (Rotated PC)')
         self.line_ae, = self.ax.plot([self.A[0], self.E[0]], [self.A[1], self.E[1]], 'k--')
-        self.trace_line, = self.ax.plot(self.trace_x, self.trace_y, 'r:', label="E's Path")
+        self.trace_line, = self.ax.plot(*self.trace.xy(), 'r:', label="E's Path")
 
         # --- Points ---
         self.ax.plot(self.A[0], self.A[1], 'ko')
@@ -56,8 +99,8 @@ class InteractiveRotation:
         self.ax.text(self.A[0], self.A[1] + 0.2, 'A')
         self.ax.text(self.B[0] + 0.2, self.B[1], 'B')
         self.ax.text(self.C[0] + 0.2, self.C[1] + 0.2, 'C')
-        self.text_p = self.ax.text(self.P[0], self.P[1] - 0.5, 'P')
-        self.text_e = self.ax.text(self.E[0] + 0.2, self.E[1], 'E')
+        self.text_p = add_text(self.ax, self.P[0], self.P[1] - 0.5, 'P')
+        self.text_e = add_text(self.ax, self.E[0] + 0.2, self.E[1], 'E')
 
         # --- Formatting ---
         self.ax.set_title('Interactive Rotation - Drag Point P on the x-axis')
@@ -71,49 +114,91 @@ class InteractiveRotation:
         self.ax.set_ylim(-15, 10)
         self.ax.legend()
 
-    def update_plot(self, p_x_coord):
-        self.P = np.array([p_x_coord, 0])
-        self.E = self.calculate_e(self.P)
-        
-        # Update lines
-        self.line_pc.set_data([self.P[0], self.C[0]], [self.P[1], self.C[1]])
-        self.line_ce.set_data([self.C[0], self.E[0]], [self.C[1], self.E[1]])
-        self.line_ae.set_data([self.A[0], self.E[0]], [self.A[1], self.E[1]])
-        
-        # Update points
-        self.point_p.set_data([self.P[0]], [self.P[1]])
-        self.point_e.set_data([self.E[0]], [self.E[1]])
-        
-        # Update text
-        self.text_p.set_position((self.P[0], self.P[1] - 0.5))
-        self.text_e.set_position((self.E[0] + 0.2, self.E[1]))
-        
-        # Update trace
-        self.trace_x.append(self.E[0])
-        self.trace_y.append(self.E[1])
-        self.trace_line.set_data(self.trace_x, self.trace_y)
+    def init_scene(self):
+        """Declares E = rotation of P around C and binds the moving artists to it."""
+        scene = self.scene = Scene()
+        node_a = scene.point(*self.A)
+        node_c = scene.point(*self.C)
+        self.node_p = scene.point(*self.P)
+        self.node_e = scene.rotation(self.node_p, node_c, 90)
+
+        # Lines
+        scene.bind([self.node_p, node_c], polyline(self.line_pc))
+        scene.bind([node_c, self.node_e], polyline(self.line_ce))
+        scene.bind([node_a, self.node_e], polyline(self.line_ae))
+
+        # Points and text
+        scene.bind([self.node_p], marker(self.point_p))
+        scene.bind([self.node_e], marker(self.point_e))
+        scene.bind([self.node_p], label(self.text_p, 0, -0.5))
+        scene.bind([self.node_e], label(self.text_e, 0.2, 0))
+
+        # Keep the hit-testing index in step with the draggable point
+        scene.bind([self.node_p], lambda _: self.handles.moved(self.point_p))
+
+        # Trace (the precomputed locus does not change while dragging)
+        if not self.locus:
+            scene.bind([self.node_e], self.extend_trace)
+
+    def extend_trace(self, e):
+        self.trace.append(*e)
+        self.trace_line.set_data(*self.trace.xy())
+
+    def solve_plot(self, p_x_coord):
+        """Solves the construction for a new P without touching any artist (safe on a worker thread)."""
+        key = None
+        if self.frames is not None:
+            key, p_x_coord = self.frames.quantize(p_x_coord)
+
+        # Move P; only E is recomputed
+        self.scene.set(self.node_p, (float(p_x_coord), 0.0))
+        return key, self.scene.solve(), self.scene.snapshot()
+
+    def apply_plot(self, update):
+        """Moves the artists bound to P or E and draws the frame (GUI thread)."""
+        key, changed, values = update
+        self.scene.apply(changed, values)
+        # Node values are immutable (x, y) tuples, so they can be shared without copying
+        self.P = values[self.node_p.id]
+        self.E = values[self.node_e.id]
+
+        self.blitter.update(key)
 
-        self.fig.canvas.draw_idle()
+    def update_plot(self, p_x_coord):
+        self.apply_plot(self.solve_plot(p_x_coord))
 
     def on_press(self, event):
         if event.inaxes != self.ax: return
-        contains, _ = self.point_p.contains(event)
-        if contains:
+        if self.handles.find(event) is self.point_p:
             self.is_dragging = True
             # Clear trace on new drag
-            self.trace_x = [self.E[0]]
-            self.trace_y = [self.E[1]]
+            if not self.locus:
+                self.trace.reset(*self.E)
 
     def on_motion(self, event):
         if not self.is_dragging or event.inaxes != self.ax: return
-        self.update_plot(event.xdata)
+        self.scheduler.submit(event.xdata)
 
     def on_release(self, event):
+        self.scheduler.flush()
         self.is_dragging = False
 
     def show(self):
         plt.show()
 
-if __name__ == '__main__':
+def build_figure(p_x=None):
+    """Builds the figure without showing it (for headless rendering); p_x sets the P x-coordinate."""
+    plot = InteractiveRotation(blit=False, fps=None)
+    if p_x is not None:
+        plot.update_plot(p_x)
+    return plot.fig
+
+def main(show=True):
+    """Opens the interactive figure; with show=False it is only built and returned."""
     plot = InteractiveRotation()
-    plot.show()
+    if show:
+        plot.show()
+    return plot
+
+if __name__ == '__main__':
+    main()
@@ -2,10 +2,21 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+import batch_solvers
+from blit_manager import BlitManager
+from frame_cache import FrameCache
+from frame_scheduler import FrameScheduler
+from geometry_kernel import Scene, label, marker, merge_updates, polyline
+from geometry_worker import GeometryWorker
+from hit_index import HandleIndex
+from locus import compute_locus, half_line
+from sprite_text import add_text
+
 class InteractiveProblem3:
-    def __init__(self):
+    def __init__(self, blit=True, fps=60, locus=True, cache_mb=0, cache_step=0.03, threaded=False):
         self.fig, self.ax = plt.subplots(figsize=(10, 10))
         self.is_dragging = False
+        self.locus = locus
 
         # --- Fixed Points ---
         self.A = np.array([0, 3])
@@ -14,11 +25,29 @@ class InteractiveProblem3:
         self.D = np.array([3, 0])
 
         # --- Draggable Point P and dependent points ---
-        self.P = np.array([5.0, 0]) # Initial position
-        self.Q, self.F, self.F_prime = self.update_dependent_points(self.P)
+        self.P = (5.0, 0.0) # Initial position; P and the dependent points are (x, y) tuples, as the scene keeps them
+        self.Q, self.F, self.F_prime = (tuple(map(float, point)) for point in self.update_dependent_points(self.P))
 
-        # --- Initialize plot elements ---
+        # --- Initialize plot elements and the construction driving them ---
         self.init_plot()
+        self.handles = HandleIndex(self.ax)
+        self.handles.add(self.point_p)
+        self.init_scene()
+
+        # --- Optional cache of rendered frames per (snapped) P position ---
+        self.frames = FrameCache(cache_step, cache_mb) if cache_mb else None
+        self.blitter = BlitManager(self.fig.canvas, [
+            self.line_cdq, self.line_ap, self.line_pq, self.line_bq, self.line_bf,
+            self.line_qf, self.line_af, self.line_cbf_prime, self.line_qcf_prime,
+            self.point_p, self.point_q, self.point_f, self.point_f_prime,
+            self.text_q, self.text_f, self.text_f_prime,
+        ], enabled=blit, cache=self.frames)
+
+        # --- Coalesce drag events to at most one update per frame, or solve them on a worker thread ---
+        if threaded:
+            self.scheduler = GeometryWorker(self.fig.canvas, self.solve_plot, self.apply_plot, fps=fps, merge=merge_updates)
+        else:
+            self.scheduler = FrameScheduler(self.fig.canvas, self.update_plot, fps=fps)
 
         # --- Connect mouse events ---
         self.fig.canvas.mpl_connect('button_press_event', self.on_press)
@@ -26,40 +55,17 @@ class InteractiveProblem3:
         self.fig.canvas.mpl_connect('button_release_event', self.on_release)
 
     def update_dependent_points(self, p_point):
-        # 1. Calculate Q
-        k_ap = (p_point[1] - self.A[1]) / (p_point[0] - self.A[0])
-        k_pq = -1 / k_ap
-        # Line PQ: y - p_y = k_pq * (x - p_x) => y = k_pq * (x - p_point[0])
-        # Line CD: y = x - 3 (slope is 1)
-        # k_pq * (x_q - p_point[0]) = x_q - 3
-        # k_pq*x_q - k_pq*p_point[0] = x_q - 3
-        # x_q * (k_pq - 1) = k_pq*p_point[0] - 3
-        x_q = (k_pq * p_point[0] - 3) / (k_pq - 1)
-        y_q = x_q - 3
-        Q = np.array([x_q, y_q])
-
-        # 2. Calculate F
-        k_bq = (Q[1] - self.B[1]) / (Q[0] - self.B[0])
-        # From tan(45)=1, we get k_bf = (k_bq - 1) / (k_bq + 1) or (k_bq+1)/(1-k_bq)
-        # We test both to find the one on the correct side of the line
-        k_bf1 = (k_bq - 1) / (k_bq + 1)
-        k_bf2 = (k_bq + 1) / (1 - k_bq)
-        # Line DA: y = -x + 3
-        # Line BF: y = k_bf * (x + 2)
-        # -x + 3 = k_bf*x + 2*k_bf => x(-1-k_bf) = 2*k_bf - 3 => x = (3-2k_bf)/(1+k_bf)
-        x_f1 = (3 - 2*k_bf1) / (1 + k_bf1)
-        x_f2 = (3 - 2*k_bf2) / (1 + k_bf2)
-        # F must be on DA extension, so x_f < 0
-        x_f = x_f1 if x_f1 < 0 else x_f2
-        y_f = -x_f + 3
-        F = np.array([x_f, y_f])
-
-        # 3. Calculate F_prime (F rotated -90 deg around B)
-        vec_bf = F - self.B
-        vec_bf_rotated = np.array([vec_bf[1], -vec_bf[0]]) # (x,y) -> (y,-x) for -90 deg
-        F_prime = self.B + vec_bf_rotated
-        
-        return Q, F, F_prime
+        """Q, F and F' for P on the x-axis (see batch_solvers.problem3_points for the construction)."""
+        return batch_solvers.problem3_points(p_point[0], self.A, self.B, self.C, self.D)
+
+    def dependent_points_batch(self, p_x_coords):
+        """Vectorized update_dependent_points for an array of P x-coordinates; returns (N, 2) arrays Q, F, F'."""
+        return batch_solvers.problem3_points(p_x_coords, self.A, self.B, self.C, self.D)
+
+    def calculate_loci(self, samples=2001, length=40.0):
+        """Paths of Q, F and F' for P anywhere beyond D, computed once per configuration."""
+        key = ('t003-3', tuple(map(tuple, (self.A, self.B, self.C, self.D))), samples, length)
+        return compute_locus(key, self.dependent_points_batch, half_line(self.D[0], length, samples), max_jump=2.0)
 
     def init_plot(self):
         # --- Main Lines ---
@@ -81,9 +87,14 @@ class InteractiveProblem3:
         points = {'A': self.A, 'B': self.B, 'C': self.C, 'D': self.D}
         for name, pos in points.items(): self.ax.plot(pos[0], pos[1], 'ko'); self.ax.text(pos[0], pos[1]+0.3, name)
         self.point_p, = self.ax.plot(self.P[0], self.P[1], 'ro', markersize=10, label='Drag P')
-        self.point_q, = self.ax.plot(self.Q[0], self.Q[1], 'go'); self.text_q = self.ax.text(self.Q[0], self.Q[1]+0.3, 'Q')
-        self.point_f, = self.ax.plot(self.F[0], self.F[1], 'bo'); self.text_f = self.ax.text(self.F[0], self.F[1]+0.3, 'F')
-        self.point_f_prime, = self.ax.plot(self.F_prime[0], self.F_prime[1], 'mo'); self.text_f_prime = self.ax.text(self.F_prime[0], self.F_prime[1]+0.3, "F'")
+        self.point_q, = self.ax.plot(self.Q[0], self.Q[1], 'go'); self.text_q = add_text(self.ax, self.Q[0], self.Q[1]+0.3, 'Q')
+        self.point_f, = self.ax.plot(self.F[0], self.F[1], 'bo'); self.text_f = add_text(self.ax, self.F[0], self.F[1]+0.3, 'F')
+        self.point_f_prime, = self.ax.plot(self.F_prime[0], self.F_prime[1], 'mo'); self.text_f_prime = add_text(self.ax, self.F_prime[0], self.F_prime[1]+0.3, "F'")
+
+        # --- Precomputed paths of Q, F, F' (static: drawn once with the background) ---
+        if self.locus:
+            for points, color, name in zip(self.calculate_loci(), 'gbm', ['Q', 'F', "F'"]):
+                self.ax.plot(*points.T, color=color, linestyle=':', linewidth=1, alpha=0.6, label=f"{name}'s path")
 
         # --- Formatting ---
         self.ax.set_title('Interactive Proof for Q3 - Drag Point P')
@@ -93,46 +104,98 @@ class InteractiveProblem3:
         self.ax.set_xlim(-10, 15); self.ax.set_ylim(-10, 15)
         self.ax.legend(fontsize='small')
 
+    def init_scene(self):
+        """Declares the Q, F, F' construction as a dependency graph and binds the moving artists to it."""
+        scene = self.scene = Scene()
+        node_a, node_b, node_c, node_d = (scene.point(*pos) for pos in (self.A, self.B, self.C, self.D))
+        self.node_p = node_p = scene.point(*self.P)
+
+        # 1. Q: perpendicular to AP through P, on line CD
+        line_cd = scene.line(node_c, node_d)
+        line_pq = scene.perpendicular(scene.line(node_a, node_p), node_p)
+        self.node_q = node_q = scene.intersection(line_pq, line_cd)
+
+        # 2. F: BF at 45 degrees to BQ, on the extension of DA (x_f < 0)
+        line_da = scene.line(node_d, node_a)
+        f1 = scene.intersection(scene.line(node_b, scene.rotation(node_q, node_b, -45)), line_da)
+        f2 = scene.intersection(scene.line(node_b, scene.rotation(node_q, node_b, 45)), line_da)
+        self.node_f = node_f = scene.derived(lambda f1, f2: f1 if f1[0] < 0 else f2, f1, f2)
+
+        # 3. F': F rotated -90 degrees around B
+        self.node_f_prime = node_f_prime = scene.rotation(node_f, node_b, -90)
+
+        # Lines
+        scene.bind([node_c, node_q], polyline(self.line_cdq))
+        scene.bind([node_a, node_p], polyline(self.line_ap))
+        scene.bind([node_p, node_q], polyline(self.line_pq))
+        scene.bind([node_b, node_q], polyline(self.line_bq))
+        scene.bind([node_b, node_f], polyline(self.line_bf))
+        scene.bind([node_q, node_f], polyline(self.line_qf))
+        scene.bind([node_a, node_f], polyline(self.line_af))
+        scene.bind([node_c, node_b, node_f_prime], polyline(self.line_cbf_prime))
+        scene.bind([node_q, node_c, node_f_prime], polyline(self.line_qcf_prime))
+
+        # Points and text
+        scene.bind([node_p], marker(self.point_p))
+        for node, point, text in [(node_q, self.point_q, self.text_q), (node_f, self.point_f, self.text_f),
+                                  (node_f_prime, self.point_f_prime, self.text_f_prime)]:
+            scene.bind([node], marker(point))
+            scene.bind([node], label(text, 0, 0.3))
+
+        # Keep the hit-testing index in step with the draggable point
+        scene.bind([node_p], lambda _: self.handles.moved(self.point_p))
+
+    def solve_plot(self, p_x_coord):
+        """Solves the construction for a new P without touching any artist (safe on a worker thread)."""
+        key = None
+        if self.frames is not None:
+            key, p_x_coord = self.frames.quantize(p_x_coord)
+
+        # Move P; only the nodes downstream of P are recomputed
+        self.scene.set(self.node_p, (float(p_x_coord), 0.0))
+        return key, self.scene.solve(), self.scene.snapshot()
+
+    def apply_plot(self, update):
+        """Moves the artists bound to the changed nodes and draws the frame (GUI thread)."""
+        key, changed, values = update
+        self.scene.apply(changed, values)
+        # Node values are immutable (x, y) tuples, so they can be shared without copying
+        self.P = values[self.node_p.id]
+        self.Q, self.F, self.F_prime = (values[node.id] for node in (self.node_q, self.node_f, self.node_f_prime))
+
+        self.blitter.update(key)
+
     def update_plot(self, p_x_coord):
-        self.P = np.array([p_x_coord, 0])
-        self.Q, self.F, self.F_prime = self.update_dependent_points(self.P)
-
-        # Update lines
-        self.line_cdq.set_data([self.C[0], self.Q[0]], [self.C[1], self.Q[1]])
-        self.line_ap.set_data([self.A[0], self.P[0]], [self.A[1], self.P[1]])
-        self.line_pq.set_data([self.P[0], self.Q[0]], [self.P[1], self.Q[1]])
-        self.line_bq.set_data([self.B[0], self.Q[0]], [self.B[1], self.Q[1]])
-        self.line_bf.set_data([self.B[0], self.F[0]], [self.B[1], self.F[1]])
-        self.line_qf.set_data([self.Q[0], self.F[0]], [self.Q[1], self.F[1]])
-        self.line_af.set_data([self.A[0], self.F[0]], [self.A[1], self.F[1]])
-        self.line_cbf_prime.set_data(*zip(self.C, self.B, self.F_prime))
-        self.line_qcf_prime.set_data(*zip(self.Q, self.C, self.F_prime))
-
-        # Update points and text
-        self.point_p.set_data([self.P[0]], [self.P[1]])
-        for point, text, name in [(self.point_q, self.text_q, 'Q'), (self.point_f, self.text_f, 'F'), (self.point_f_prime, self.text_f_prime, "F'")]:
-            attr_name = name.replace("'", "_prime")
-            point_coords = getattr(self, attr_name)
-            point.set_data([point_coords[0]], [point_coords[1]])
-            text.set_position((point_coords[0], point_coords[1] + 0.3))
-
-        self.fig.canvas.draw_idle()
+        self.apply_plot(self.solve_plot(p_x_coord))
 
     def on_press(self, event):
         if event.inaxes != self.ax: return
-        contains, _ = self.point_p.contains(event)
-        if contains: self.is_dragging = True
+        if self.handles.find(event) is self.point_p: self.is_dragging = True
 
     def on_motion(self, event):
         if not self.is_dragging or event.inaxes != self.ax: return
-        if event.xdata > self.D[0]: self.update_plot(event.xdata)
+        if event.xdata > self.D[0]: self.scheduler.submit(event.xdata)
 
     def on_release(self, event):
+        self.scheduler.flush()
         self.is_dragging = False
 
     def show(self):
         plt.show()
 
-if __name__ == '__main__':
+def build_figure(p_x=None):
+    """Builds the figure without showing it (for headless rendering); p_x sets the P x-coordinate."""
+    plot = InteractiveProblem3(blit=False, fps=None)
+    if p_x is not None:
+        plot.update_plot(p_x)
+    return plot.fig
+
+def main(show=True):
+    """Opens the interactive figure; with show=False it is only built and returned."""
     plot = InteractiveProblem3()
-    plot.show()
+    if show:
+        plot.show()
+    return plot
+
+if __name__ == '__main__':
+    main()
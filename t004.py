@@ -3,10 +3,21 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.patches import Circle, Arc
 
+import batch_solvers
+from blit_manager import BlitManager
+from frame_cache import FrameCache
+from frame_scheduler import FrameScheduler
+from geometry_kernel import Scene, circle_patch, label, marker, merge_updates, polyline
+from geometry_worker import GeometryWorker
+from hit_index import HandleIndex
+from locus import compute_locus, open_interval
+from sprite_text import add_text
+
 class InteractiveGeometry:
-    def __init__(self):
+    def __init__(self, blit=True, fps=60, locus=True, cache_mb=0, cache_step=0.01, threaded=False):
         self.fig, self.ax = plt.subplots(figsize=(9, 9))
         self.is_dragging = False
+        self.locus = locus
 
         # --- Initial setup ---
         self.A = np.array([0, 4])
@@ -14,10 +25,26 @@ class InteractiveGeometry:
         self.O = np.array([0, 0])
         
         # --- Draggable Point E ---
-        self.E = np.array([0, 2.0]) # Initial position
+        self.E = (0.0, 2.0) # Initial position; an (x, y) tuple, as the scene keeps it
 
-        # --- Initialize all plot elements ---
+        # --- Initialize all plot elements and the construction driving them ---
         self.init_plot()
+        self.handles = HandleIndex(self.ax)
+        self.handles.add(self.point_E)
+        self.init_scene()
+
+        # --- Optional cache of rendered frames per (snapped) E position ---
+        self.frames = FrameCache(cache_step, cache_mb) if cache_mb else None
+        self.blitter = BlitManager(self.fig.canvas, [
+            self.circle, self.line_AC, self.line_BE, self.line_OD, self.line_CD, self.line_DB,
+            self.point_E, self.point_C, self.point_D, self.text_E, self.text_C, self.text_D,
+        ], enabled=blit, cache=self.frames)
+
+        # --- Coalesce drag events to at most one update per frame, or solve them on a worker thread ---
+        if threaded:
+            self.scheduler = GeometryWorker(self.fig.canvas, self.solve_plot, self.apply_plot, fps=fps, merge=merge_updates)
+        else:
+            self.scheduler = FrameScheduler(self.fig.canvas, self.update_plot, fps=fps)
 
         # --- Connect mouse events to handlers ---
         self.fig.canvas.mpl_connect('button_press_event', self.on_press)
@@ -25,26 +52,19 @@ class InteractiveGeometry:
         self.fig.canvas.mpl_connect('button_release_event', self.on_release)
 
     def calculate_positions(self, e_coord):
-        """Calculates C and D based on E's y-coordinate."""
-        E = np.array([0, e_coord])
-        # Avoid division by zero if E is at (0,0)
-        if abs(E[0] - self.B[0]) < 1e-9:
-            m_BE = 1e9
-        else:
-            m_BE = (E[1] - self.B[1]) / (E[0] - self.B[0])
-        
-        if abs(m_BE) < 1e-9:
-             m_AC = 1e9
-        else:
-            m_AC = -1 / m_BE
+        """Calculates E, C and D based on E's y-coordinate (see batch_solvers.geometry_positions)."""
+        return batch_solvers.geometry_positions(e_coord, self.A, self.B, self.O)
 
-        x_C = -4 / m_AC
-        C = np.array([x_C, 0])
+    def calculate_positions_batch(self, e_coords):
+        """Vectorized calculate_positions for an array of E y-coordinates; returns (N, 2) arrays E, C, D."""
+        return batch_solvers.geometry_positions(e_coords, self.A, self.B, self.O)
 
-        x_D = (-4 - 4 * m_BE) / (m_AC - m_BE)
-        y_D = m_AC * x_D + 4
-        D = np.array([x_D, y_D])
-        return E, C, D
+    def calculate_loci(self, samples=2001):
+        """Paths of C and D for E anywhere strictly between O and A, computed once per configuration."""
+        key = ('t004', tuple(map(tuple, (self.A, self.B, self.O))), samples)
+        _, locus_c, locus_d = compute_locus(key, self.calculate_positions_batch,
+                                            open_interval(self.O[1], self.A[1], samples), max_jump=1.0)
+        return locus_c, locus_d
 
     def init_plot(self):
         E, C, D = self.calculate_positions(self.E[1])
@@ -52,7 +72,7 @@ class InteractiveGeometry:
         # --- Draw Auxiliary Circle ---
         center_x = (C[0] + self.B[0]) / 2
         radius = np.linalg.norm(C - self.B) / 2
-        self.circle = Circle((center_x, 0), radius, color='orange', fill=False, linestyle='-.', linewidth=1.5, label='Auxiliary Circle (C,O,D,B)')
+        self.circle = Circle((center_x, 0), radius, color='orange', fill=False, linestyle='-.', linewidth=1.5, label='Auxiliary Circle (C,D,B)')
         self.ax.add_patch(self.circle)
 
         # --- Draw Lines ---
@@ -73,9 +93,15 @@ class InteractiveGeometry:
         self.text_A = self.ax.text(self.A[0] - 0.2, self.A[1] + 0.2, 'A')
         self.text_B = self.ax.text(self.B[0] + 0.2, self.B[1] + 0.2, 'B')
         self.text_O = self.ax.text(self.O[0] - 0.2, self.O[1] - 0.3, 'O')
-        self.text_E = self.ax.text(E[0] + 0.2, E[1], 'E')
-        self.text_C = self.ax.text(C[0] - 0.2, C[1] - 0.3, 'C')
-        self.text_D = self.ax.text(D[0] + 0.2, D[1] + 0.2, 'D')
+        self.text_E = add_text(self.ax, E[0] + 0.2, E[1], 'E')
+        self.text_C = add_text(self.ax, C[0] - 0.2, C[1] - 0.3, 'C')
+        self.text_D = add_text(self.ax, D[0] + 0.2, D[1] + 0.2, 'D')
+
+        # --- Precomputed paths of C and D (static: drawn once with the background) ---
+        if self.locus:
+            locus_c, locus_d = self.calculate_loci()
+            self.ax.plot(*locus_c.T, color='gray', linestyle=':', linewidth=2, alpha=0.6)
+            self.ax.plot(*locus_d.T, color='gray', linestyle=':', linewidth=1.5, alpha=0.6, label="Paths of C and D")
 
         # --- Formatting ---
         self.ax.set_title('Interactive Geometry - Drag Point E')
@@ -89,39 +115,67 @@ class InteractiveGeometry:
         self.ax.set_ylim(-2, 6)
         self.ax.legend()
 
-    def update_plot(self, e_coord):
-        E, C, D = self.calculate_positions(e_coord)
-        self.E = E
-
-        # Update lines
-        self.line_AC.set_data([self.A[0], C[0]], [self.A[1], C[1]])
-        self.line_BE.set_data([self.B[0], E[0]], [self.B[1], E[1]])
-        self.line_OD.set_data([self.O[0], D[0]], [self.O[1], D[1]])
-        self.line_CD.set_data([C[0], D[0]], [C[1], D[1]])
-        self.line_DB.set_data([D[0], self.B[0]], [D[1], self.B[1]])
-
-        # Update points
-        self.point_E.set_data([E[0]], [E[1]])
-        self.point_C.set_data([C[0]], [C[1]])
-        self.point_D.set_data([D[0]], [D[1]])
-
-        # Update text
-        self.text_E.set_position((E[0] + 0.2, E[1]))
-        self.text_C.set_position((C[0] - 0.2, C[1] - 0.3))
-        self.text_D.set_position((D[0] + 0.2, D[1] + 0.2))
-
-        # Update circle
-        center_x = (C[0] + self.B[0]) / 2
-        radius = np.linalg.norm(C - self.B) / 2
-        self.circle.set_center((center_x, 0))
-        self.circle.set_radius(radius)
+    def init_scene(self):
+        """Declares C, D and the auxiliary circle as a dependency graph and binds the moving artists to it."""
+        scene = self.scene = Scene()
+        node_a, node_b, node_o = (scene.point(*pos) for pos in (self.A, self.B, self.O))
+        self.node_e = node_e = scene.point(*self.E)
+
+        # AC is perpendicular to BE; C lies on the x-axis, D on BE
+        line_be = scene.line(node_b, node_e)
+        line_ac = scene.perpendicular(line_be, node_a)
+        x_axis = scene.line(node_o, node_b)
+        node_c = scene.intersection(line_ac, x_axis)
+        node_d = scene.intersection(line_ac, line_be)
+        # Angle CDB is a right angle, so D lies on the circle with diameter CB
+        circle = scene.circle(scene.midpoint(node_c, node_b), node_b)
+
+        # Lines
+        scene.bind([node_a, node_c], polyline(self.line_AC))
+        scene.bind([node_b, node_e], polyline(self.line_BE))
+        scene.bind([node_o, node_d], polyline(self.line_OD))
+        scene.bind([node_c, node_d], polyline(self.line_CD))
+        scene.bind([node_d, node_b], polyline(self.line_DB))
+
+        # Points and text
+        scene.bind([node_e], marker(self.point_E))
+        scene.bind([node_c], marker(self.point_C))
+        scene.bind([node_d], marker(self.point_D))
+        scene.bind([node_e], label(self.text_E, 0.2, 0))
+        scene.bind([node_c], label(self.text_C, -0.2, -0.3))
+        scene.bind([node_d], label(self.text_D, 0.2, 0.2))
+
+        # Keep the hit-testing index in step with the draggable point
+        scene.bind([node_e], lambda _: self.handles.moved(self.point_E))
+
+        # Circle
+        scene.bind([circle], circle_patch(self.circle))
+
+    def solve_plot(self, e_coord):
+        """Solves the construction for a new E without touching any artist (safe on a worker thread)."""
+        key = None
+        if self.frames is not None:
+            key, e_coord = self.frames.quantize(e_coord)
+
+        # Move E; only the nodes downstream of E are recomputed
+        self.scene.set(self.node_e, (0.0, float(e_coord)))
+        return key, self.scene.solve(), self.scene.snapshot()
+
+    def apply_plot(self, update):
+        """Moves the artists bound to the changed nodes and draws the frame (GUI thread)."""
+        key, changed, values = update
+        self.scene.apply(changed, values)
+        # Node values are immutable (x, y) tuples, so they can be shared without copying
+        self.E = values[self.node_e.id]
+
+        self.blitter.update(key)
 
-        self.fig.canvas.draw_idle()
+    def update_plot(self, e_coord):
+        self.apply_plot(self.solve_plot(e_coord))
 
     def on_press(self, event):
         if event.inaxes != self.ax: return
-        contains, _ = self.point_E.contains(event)
-        if contains:
+        if self.handles.find(event) is self.point_E:
             self.is_dragging = True
 
     def on_motion(self, event):
@@ -129,15 +183,29 @@ class InteractiveGeometry:
         # Clamp E's movement to be on the y-axis between O and A
         y = event.ydata
         if 0.01 < y < 3.99: # Avoid placing E exactly on O or A
-            self.update_plot(y)
+            self.scheduler.submit(y)
 
     def on_release(self, event):
+        self.scheduler.flush()
         self.is_dragging = False
 
     def show(self):
         plt.show()
 
+def build_figure(e_y=None):
+    """Builds the figure without showing it (for headless rendering); e_y sets the E y-coordinate."""
+    plot = InteractiveGeometry(blit=False, fps=None)
+    if e_y is not None:
+        plot.update_plot(e_y)
+    return plot.fig
+
+def main(show=True):
+    """Opens the interactive figure; with show=False it is only built and returned."""
+    plot = InteractiveGeometry()
+    if show:
+        plot.show()
+    return plot
+
 # --- Main Execution ---
 if __name__ == '__main__':
-    plot = InteractiveGeometry()
-    plot.show()
+    main()
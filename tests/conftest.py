@@ -0,0 +1,6 @@
+"""Runs the tests headless against the modules in the repository root."""
+import os
+import sys
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+
+import export_animation
+
+FRAMES = 3
+FPS = 20
+DPI = 30
+
+
+@pytest.fixture(scope='module')
+def expected_frames():
+    """The frames of a t002 sweep, rendered straight from the figure."""
+    source = export_animation.FrameSource('t002', DPI)
+    try:
+        return [np.asarray(source.render(value)) for value in export_animation.driver_path('t002', FRAMES)]
+    finally:
+        source.close()
+
+
+def read_frames(path):
+    with Image.open(path) as image:
+        info = dict(image.info)
+        frames = [(np.asarray(frame.convert('RGBA')), frame.info.get('duration'))
+                  for frame in ImageSequence.Iterator(image)]
+    return info, frames
+
+
+def test_apng_round_trip_is_lossless(tmp_path, expected_frames):
+    path = export_animation.export('t002', tmp_path / 't002.png', fmt='apng', frames=FRAMES, fps=FPS, dpi=DPI)
+    info, frames = read_frames(path)
+    assert info['loop'] == 0 and len(frames) == FRAMES
+    for (pixels, duration), expected in zip(frames, expected_frames):
+        assert duration == 1000 / FPS
+        np.testing.assert_array_equal(pixels, expected)
+
+
+def test_gif_round_trip(tmp_path, expected_frames):
+    path = export_animation.export('t002', tmp_path / 't002.gif', fmt='gif', frames=FRAMES, fps=FPS, dpi=DPI)
+    info, frames = read_frames(path)
+    assert info['loop'] == 0 and len(frames) == FRAMES
+    for (pixels, duration), expected in zip(frames, expected_frames):
+        assert duration == 1000 / FPS
+        assert pixels.shape == expected.shape
+        # Each frame has its own 256-colour table, so only quantization error is left
+        assert np.abs(pixels[..., :3].astype(int) - expected[..., :3]).mean() < 2
+
+
+def test_parallel_export_writes_the_same_file(tmp_path):
+    serial = export_animation.export('t002', tmp_path / 'serial.png', fmt='apng', frames=FRAMES, dpi=DPI)
+    parallel = export_animation.export('t002', tmp_path / 'parallel.png', fmt='apng', frames=FRAMES, dpi=DPI, jobs=2)
+    assert serial.read_bytes() == parallel.read_bytes()
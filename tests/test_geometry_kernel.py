@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+import pytest
+
+import batch_solvers
+from geometry_kernel import Scene, merge_updates
+from problems import PROBLEMS, load_problem
+
+
+def t004_scene():
+    # The construction of t004.py: AC perpendicular to BE, C on OB, D on BE
+    scene = Scene()
+    node_a, node_b, node_o = scene.point(0, 4), scene.point(4, 0), scene.point(0, 0)
+    node_e = scene.point(0, 2)
+    line_be = scene.line(node_b, node_e)
+    line_ac = scene.perpendicular(line_be, node_a)
+    node_c = scene.intersection(line_ac, scene.line(node_o, node_b))
+    node_d = scene.intersection(line_ac, line_be)
+    return scene, node_e, node_c, node_d
+
+
+def test_t004_scene_matches_batch_solver():
+    scene, node_e, node_c, node_d = t004_scene()
+    e_y = np.linspace(0.05, 3.95, 40)
+    E, C, D = batch_solvers.geometry_positions(e_y)
+    for i, y in enumerate(e_y):
+        scene.set(node_e, (0.0, float(y)))
+        scene.solve()
+        np.testing.assert_allclose(node_e.value, E[i])
+        np.testing.assert_allclose(node_c.value, C[i], atol=1e-12)
+        np.testing.assert_allclose(node_d.value, D[i], atol=1e-12)
+
+
+@pytest.mark.parametrize('name, cls, solver, attrs', [
+    ('t002', 'InteractiveRotation', batch_solvers.rotation_e, ('E',)),
+    ('t003-3', 'InteractiveProblem3', batch_solvers.problem3_points, ('Q', 'F', 'F_prime')),
+])
+def test_figure_scene_matches_batch_solver(name, cls, solver, attrs):
+    plot = getattr(load_problem(name), cls)(blit=False, fps=None)
+    _, low, high = PROBLEMS[name].sweep
+    values = np.linspace(low, high, 25)
+    expected = solver(values)
+    expected = expected if isinstance(expected, tuple) else (expected,)
+    for i, value in enumerate(values):
+        plot.update_plot(float(value))
+        for attr, points in zip(attrs, expected):
+            np.testing.assert_allclose(getattr(plot, attr), points[i], atol=1e-9)
+
+
+def test_solve_recomputes_only_downstream_nodes():
+    scene, node_e, node_c, node_d = t004_scene()
+    other = scene.point(1, 1)
+    calls = []
+    scene.bind([node_c], lambda c: calls.append('C'))
+    scene.bind([other], lambda p: calls.append('other'))
+
+    assert scene.update() == set()
+    scene.set(node_e, (0.0, 3.0))
+    changed = scene.update()
+    assert node_e in changed and node_c in changed and node_d in changed and other not in changed
+    assert calls == ['C']
+
+    # Moving a point to where it already is changes nothing
+    scene.set(node_e, (0.0, 3.0))
+    assert scene.update() == set()
+
+
+def test_parallel_lines_give_nan_and_derived_nodes_cannot_be_set():
+    scene = Scene()
+    l1 = scene.line(scene.point(0, 0), scene.point(1, 1))
+    l2 = scene.line(scene.point(0, 1), scene.point(2, 3))
+    meet = scene.intersection(l1, l2)
+    assert all(math.isnan(v) for v in meet.value)
+    with pytest.raises(ValueError):
+        scene.set(meet, (0.0, 0.0))
+
+
+def test_apply_reads_the_snapshot_not_the_live_values():
+    scene, node_e, node_c, _ = t004_scene()
+    seen = []
+    scene.bind([node_c], seen.append)
+    scene.set(node_e, (0.0, 1.0))
+    changed, values = scene.solve(), scene.snapshot()
+    scene.set(node_e, (0.0, 3.0))
+    scene.solve()
+    scene.apply(changed, values)
+    assert seen == [values[node_c.id]] and seen[0] != node_c.value
+
+
+def test_merge_updates_keeps_both_changes_and_the_newer_values():
+    _, _, node_c, node_d = t004_scene()
+    older = (None, {node_c}, ['old'])
+    newer = ('key', {node_d}, ['new'])
+    assert merge_updates(older, newer) == ('key', {node_c, node_d}, ['new'])
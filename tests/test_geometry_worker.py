@@ -0,0 +1,133 @@
+import threading
+import time
+
+from geometry_worker import _EMPTY, GeometryWorker
+
+
+class FakeTimer:
+    def __init__(self):
+        self.running = False
+
+    def add_callback(self, func):
+        self.callback = func
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+
+class FakeCanvas:
+    """Just enough canvas for the worker: the test ticks the timer itself."""
+
+    def __init__(self):
+        self.timer = FakeTimer()
+
+    def new_timer(self, interval):
+        return self.timer
+
+    def mpl_connect(self, name, func):
+        pass
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.001)
+
+
+def drain(worker):
+    """Ticks the GUI timer until every request has been solved and applied."""
+    deadline = time.monotonic() + 5.0
+    while worker.has_pending:
+        assert time.monotonic() < deadline, 'timed out'
+        worker._poll()
+        time.sleep(0.001)
+
+
+def test_requests_replaced_while_the_worker_is_busy_are_dropped():
+    gate, started = threading.Event(), []
+    applied = []
+
+    def solve(value):
+        started.append(value)
+        gate.wait()
+        return value * 10
+
+    worker = GeometryWorker(FakeCanvas(), solve, applied.append)
+    try:
+        worker.submit(1)
+        wait_until(lambda: started == [1])
+        for value in (2, 3, 4):
+            worker.submit(value)
+        assert worker.dropped == 2
+        gate.set()
+        drain(worker)
+        assert started == [1, 4]
+        assert applied[-1] == 40 and set(applied) <= {10, 40}
+        # The timer stops at the first tick with nothing left to do
+        worker._poll()
+        assert not worker._timer.running
+    finally:
+        worker.close()
+
+
+def test_results_finished_between_frames_are_merged():
+    gate = threading.Event()
+    applied = []
+
+    def solve(value):
+        gate.wait()
+        return [value]
+
+    worker = GeometryWorker(FakeCanvas(), solve, applied.append, merge=lambda older, newer: older + newer)
+    try:
+        worker.submit(1)
+        wait_until(lambda: worker._busy)
+        worker.submit(2)
+        gate.set()
+        # Both results are in before the next frame, which applies them as one
+        wait_until(lambda: worker._request is _EMPTY and not worker._busy)
+        worker._poll()
+        assert applied == [[1, 2]]
+        assert not worker.has_pending
+    finally:
+        worker.close()
+
+
+def test_failed_solve_does_not_stop_the_worker(capsys):
+    applied = []
+
+    def solve(value):
+        if value < 0:
+            raise ValueError('no construction')
+        return value
+
+    worker = GeometryWorker(FakeCanvas(), solve, applied.append)
+    try:
+        worker.submit(-1)
+        drain(worker)
+        worker.submit(5)
+        drain(worker)
+        assert applied == [5]
+        assert 'no construction' in capsys.readouterr().err
+    finally:
+        worker.close()
+
+
+def test_without_fps_every_request_is_applied_synchronously():
+    applied = []
+    worker = GeometryWorker(FakeCanvas(), lambda value: value + 1, applied.append, fps=None)
+    for value in range(3):
+        worker.submit(value)
+    assert applied == [1, 2, 3]
+    assert worker.dropped == 0 and not worker.has_pending
+
+
+def test_close_stops_the_thread():
+    worker = GeometryWorker(FakeCanvas(), lambda value: value, lambda result: None)
+    worker.close()
+    worker._thread.join(timeout=5)
+    assert not worker._thread.is_alive()
@@ -0,0 +1,144 @@
+import json
+import math
+import threading
+import urllib.error
+import urllib.request
+
+import matplotlib
+import pytest
+
+import render_server
+from problems import DOMAINS, PROBLEMS, load_problem
+
+
+def test_bytes_do_not_depend_on_loaded_scripts_or_rcparams(monkeypatch):
+    requests = [('t004', 'svg', 60, {}), ('t004', 'png', 60, {}), ('plot_parabola', 'svg', 60, {'a': -2.0})]
+    before = [render_server.render_figure(*request) for request in requests]
+    with matplotlib.rc_context():
+        load_problem('t001-2')
+        matplotlib.rcParams['lines.linewidth'] = 7
+        matplotlib.rcParams['font.size'] = 20
+        monkeypatch.setattr(render_server, '_figures', {})  # build the figures again, after the changes
+        after = [render_server.render_figure(*request) for request in requests]
+    assert before == after
+
+
+# --- Request validation and caching (server process) ---
+
+def test_check_params_follows_the_domains():
+    render_server.check_params('t004', {'e_y': 1.5})
+    render_server.check_params('plot_parabola', {'a': 5.0, 'k': -10.0})  # closed: the slider ends are allowed
+    for name, params in [('t004', {'e_y': 0.0}),              # open: O itself is excluded
+                         ('t004', {'e_y': 4.5}),
+                         ('t004', {'e_y': math.nan}),
+                         ('t001-2', {'m': math.inf}),
+                         ('plot_parabola', {'a': 5.01})]:
+        with pytest.raises(render_server.RenderError, match=next(iter(params))):
+            render_server.check_params(name, params)
+    with pytest.raises(render_server.RenderError, match='does not take x'):
+        render_server.check_params('t004', {'x': 1.0})
+    with pytest.raises(render_server.RenderError, match='parameters: none'):
+        render_server.check_params('t005-1', {'a': 1.0})
+
+
+def test_every_domain_covers_the_default_and_the_sweep():
+    for name, domains in DOMAINS.items():
+        assert name in PROBLEMS
+        sweep = PROBLEMS[name].sweep
+        if sweep is not None:
+            param, low, high = sweep
+            render_server.check_params(name, {param: low})
+            render_server.check_params(name, {param: high})
+
+
+def test_request_hash_ignores_parameter_order_and_int_vs_float():
+    key = render_server.request_hash('plot_parabola', 'png', 100, {'a': 1, 'h': 2.0})
+    assert key == render_server.request_hash('plot_parabola', 'png', 100, {'h': 2, 'a': 1.0})
+    assert key != render_server.request_hash('plot_parabola', 'svg', 100, {'a': 1, 'h': 2.0})
+    assert key != render_server.request_hash('plot_parabola', 'png', 100, {'a': 1, 'h': 2.5})
+
+
+def test_response_cache_drops_the_least_recently_used():
+    cache = render_server.ResponseCache(budget_mb=30 / 2 ** 20)  # 30 bytes
+    cache.put('a', b'x' * 10)
+    cache.put('b', b'x' * 10)
+    cache.put('c', b'x' * 10)
+    assert cache.get('a') is not None  # 'b' is now the least recently used
+    cache.put('d', b'x' * 10)
+    assert cache.get('b') is None
+    assert [cache.get(key) is not None for key in 'acd'] == [True, True, True]
+    assert len(cache) == 3 and cache.nbytes == 30
+    assert (cache.hits, cache.misses) == (4, 1)
+
+
+def test_response_cache_skips_bodies_over_budget_and_duplicates():
+    cache = render_server.ResponseCache(budget_mb=10 / 2 ** 20)
+    cache.put('big', b'x' * 11)
+    cache.put('a', b'x' * 4)
+    cache.put('a', b'y' * 4)
+    assert len(cache) == 1 and cache.nbytes == 4 and cache.get('a') == b'x' * 4
+
+
+# --- HTTP request path ---
+
+@pytest.fixture(scope='module')
+def server():
+    service = render_server.RenderService(jobs=1, cache_mb=16)
+    httpd = render_server.make_server(service, 0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://{render_server.HOST}:{httpd.server_address[1]}', service
+    httpd.shutdown()
+    httpd.server_close()
+    service.close()
+
+
+def fetch(url, method='GET', headers=None):
+    request = urllib.request.Request(url, method=method, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, dict(error.headers), error.read()
+
+
+def test_render_is_cached_and_answers_etags(server):
+    base, service = server
+    status, headers, body = fetch(base + '/render/t004.svg?e_y=1.5&dpi=50')
+    assert status == 200 and headers['Content-Type'] == 'image/svg+xml'
+    assert body.startswith(b'<?xml') and int(headers['Content-Length']) == len(body)
+    renders = service.stats()['renders']
+
+    # Same request in another parameter spelling: served from the cache, same ETag and bytes
+    status, again, body_again = fetch(base + '/render/t004.svg?dpi=50&e_y=1.50')
+    assert status == 200 and again['ETag'] == headers['ETag'] and body_again == body
+    assert service.stats()['renders'] == renders
+
+    status, head, head_body = fetch(base + '/render/t004.svg?e_y=1.5&dpi=50', method='HEAD')
+    assert status == 200 and head_body == b'' and head['Content-Length'] == headers['Content-Length']
+
+    status, _, _ = fetch(base + '/render/t004.svg?e_y=1.5&dpi=50', headers={'If-None-Match': headers['ETag']})
+    assert status == 304
+
+
+def test_bad_requests_are_rejected_before_the_pool(server):
+    base, service = server
+    renders = service.stats()['renders']
+    for path, expected in [('/render/t004.png?e_y=7', 400),
+                           ('/render/t004.png?e_y=nan', 400),
+                           ('/render/t004.png?z=1', 400),
+                           ('/render/t004.png?e_y=abc', 400),
+                           ('/render/t004.gif', 400),
+                           ('/render/t004.png?dpi=5000', 400),
+                           ('/render/t999.png', 404),
+                           ('/nothing', 404)]:
+        assert fetch(base + path)[0] == expected, path
+    assert service.stats()['renders'] == renders
+
+
+def test_problems_lists_the_domains(server):
+    base, _ = server
+    status, _, body = fetch(base + '/problems')
+    problems = json.loads(body)
+    assert status == 200 and set(problems) == set(PROBLEMS)
+    assert problems['t004']['domains'] == {'e_y': {'low': 0.0, 'high': 4.0, 'closed': False}}
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from problems import load_problem
+from root_finding import find_roots
+
+
+def test_finds_every_sign_change_and_exact_grid_roots():
+    # Roots at -2 (on the grid), 0.3 and 1.7 (between samples)
+    f = lambda x: (x + 2) * (x - 0.3) * (x - 1.7)
+    roots = find_roots(f, np.linspace(-3, 3, 61))
+    np.testing.assert_allclose(roots, [-2, 0.3, 1.7], rtol=0, atol=1e-13)
+
+
+def test_nan_samples_never_form_a_bracket():
+    with np.errstate(invalid='ignore'):
+        roots = find_roots(lambda x: np.sqrt(x) - 1, np.linspace(-4, 4, 81))
+    np.testing.assert_allclose(roots, [1.0])
+
+
+def test_newton_polish_stays_in_the_bracket():
+    f = lambda x: x ** 3 - 2
+    fprime = lambda x: 3 * x ** 2
+    root, = find_roots(f, np.linspace(0, 3, 7), xtol=1e-6, fprime=fprime)
+    assert abs(root - 2 ** (1 / 3)) < 1e-10
+
+
+@pytest.fixture(scope='module')
+def solve_cm():
+    return load_problem('t001-2').solve_cm
+
+
+@pytest.mark.parametrize('ratio, m', [(1.5, 6.0), (3.0, 12.0), (250.0, 1000.0), (1.0000001, 4.0000004)])
+def test_solve_cm(solve_cm, ratio, m):
+    # S△AMP / S△AMN = m / 4 for m > 4
+    assert solve_cm(ratio) == pytest.approx((m,), rel=1e-15)
+
+
+def test_solve_cm_has_no_root_at_or_below_m_4(solve_cm):
+    assert solve_cm(1.0) == ()
+    assert solve_cm(0.5) == ()
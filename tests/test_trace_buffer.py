@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+
+from trace_buffer import TraceBuffer, _wrap
+
+
+def max_deviation(buffer, points):
+    """Largest distance from any of `points` to the polyline kept in `buffer`."""
+    a = np.column_stack(buffer.xy())
+    start, seg = a[:-1], a[1:] - a[:-1]
+    worst = 0.0
+    for p in points:
+        t = np.clip(np.einsum('ij,ij->i', p - start, seg) / np.maximum(np.einsum('ij,ij->i', seg, seg), 1e-300), 0, 1)
+        worst = max(worst, np.hypot(*(start + t[:, None] * seg - p).T).min())
+    return worst
+
+
+def test_wrap_around_keeps_the_newest_samples_in_order():
+    buffer = TraceBuffer(capacity=5)
+    for i in range(12):
+        buffer.append(i, -i)
+    x, y = buffer.xy()
+    assert len(buffer) == 5
+    np.testing.assert_array_equal(x, [7, 8, 9, 10, 11])
+    np.testing.assert_array_equal(y, [-7, -8, -9, -10, -11])
+    # Views into the storage, not copies
+    assert np.shares_memory(x, buffer._data)
+
+
+def test_reset_starts_a_new_trace():
+    buffer = TraceBuffer(capacity=4)
+    for i in range(6):
+        buffer.append(i, i)
+    buffer.reset(10, 20)
+    assert len(buffer) == 1
+    assert [list(v) for v in buffer.xy()] == [[10], [20]]
+
+
+def test_capacity_must_hold_a_segment():
+    with pytest.raises(ValueError):
+        TraceBuffer(capacity=1)
+
+
+@pytest.mark.parametrize('tol', [0.01, 0.1])
+def test_decimated_semicircle_stays_within_tolerance(tol):
+    t = np.linspace(0, np.pi, 5000)
+    points = np.column_stack([5 * np.cos(t), 5 * np.sin(t)])
+    buffer = TraceBuffer(capacity=len(points), collinear_tol=tol)
+    buffer.reset(*points[0])
+    for p in points[1:]:
+        buffer.append(*p)
+    assert len(buffer) < len(points) // 10
+    assert max_deviation(buffer, points) <= tol * (1 + 1e-9)
+    # The endpoints survive decimation
+    x, y = buffer.xy()
+    assert (x[0], y[0]) == tuple(points[0]) and (x[-1], y[-1]) == tuple(points[-1])
+
+
+def test_straight_line_collapses_and_reversals_are_kept():
+    buffer = TraceBuffer(capacity=100, collinear_tol=0.01)
+    buffer.reset(0, 0)
+    for x in range(1, 50):
+        buffer.append(x, 0)
+    assert len(buffer) == 2
+    for x in (48, 47):
+        buffer.append(x, 0)
+    np.testing.assert_array_equal(buffer.xy()[0], [0, 49, 47])
+
+
+def test_repeated_samples_are_not_stored_twice():
+    buffer = TraceBuffer(capacity=10)
+    buffer.reset(1, 1)
+    buffer.append(2, 3)
+    buffer.append(2, 3)
+    assert len(buffer) == 2
+
+
+def test_wrap_returns_angles_in_half_open_interval():
+    assert _wrap(math.pi) == math.pi
+    assert _wrap(3 * math.pi / 2) == pytest.approx(-math.pi / 2)
+    assert _wrap(-3 * math.pi / 2) == pytest.approx(math.pi / 2)
@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+
+
+class TraceBuffer:
+    """
+    Fixed-capacity ring buffer of 2D points for drawing a locus trace.
+
+    Every sample is written twice, at `i` and `i + capacity`, so the most recent
+    `len(self)` samples are always one contiguous slice of the storage. `xy()`
+    therefore returns views without copying, and the per-frame cost is bounded
+    by `capacity` however long the drag lasts; the oldest samples are dropped.
+
+    With `collinear_tol` set, a new sample that continues the last segment in
+    the same direction replaces the previous point instead of being appended,
+    as long as every sample merged away since the last kept point stays within
+    `collinear_tol` of the new segment. Each merged sample at distance d from
+    that point allows segment directions within asin(tol / d) of its own; the
+    intersection of these angle intervals (the cone) is kept, so the check is
+    O(1) however many samples were merged.
+    """
+
+    def __init__(self, capacity=2048, collinear_tol=None):
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.capacity = capacity
+        self.collinear_tol = collinear_tol
+        self._data = np.empty((2, 2 * capacity))
+        self._head = 0  # index of the next write in [0, capacity)
+        self._size = 0
+        self._cone = None  # (reference angle, lo, hi) of the allowed directions from the anchor, or None
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self._cone = None
+
+    def reset(self, x, y):
+        """Clears the buffer and starts a new trace at (x, y)."""
+        self.clear()
+        self.append(x, y)
+
+    def _last(self, k):
+        """Returns the k-th most recent sample (k=1 is the newest)."""
+        i = (self._head - k) % self.capacity
+        return self._data[0, i], self._data[1, i]
+
+    def _is_redundant(self, x, y):
+        if self._size < 2:
+            return False
+        x1, y1 = self._last(1)
+        if x == x1 and y == y1:
+            return True
+        if self.collinear_tol is None:
+            return False
+        x0, y0 = self._last(2)
+        # The previous sample must lie between the anchor and the new point
+        if (x1 - x0) * (x - x1) + (y1 - y0) * (y - y1) < 0 or (x == x0 and y == y0):
+            self._cone = None
+            return False
+        # Narrow the cone by the previous sample, which would be merged away
+        d1 = math.hypot(x1 - x0, y1 - y0)
+        if self._cone is None:
+            ref, lo, hi = math.atan2(y1 - y0, x1 - x0), -math.pi / 2, math.pi / 2
+        else:
+            ref, lo, hi = self._cone
+        if d1 > self.collinear_tol:
+            phi = _wrap(math.atan2(y1 - y0, x1 - x0) - ref)
+            half = math.asin(self.collinear_tol / d1)
+            lo, hi = max(lo, phi - half), min(hi, phi + half)
+        theta = _wrap(math.atan2(y - y0, x - x0) - ref)
+        if lo <= theta <= hi:
+            self._cone = (ref, lo, hi)
+            return True
+        self._cone = None
+        return False
+
+    def append(self, x, y):
+        if self._is_redundant(x, y):
+            # Slide the previous sample forward instead of growing the trace
+            self._head = (self._head - 1) % self.capacity
+            self._size -= 1
+        i = self._head
+        self._data[0, i] = self._data[0, i + self.capacity] = x
+        self._data[1, i] = self._data[1, i + self.capacity] = y
+        self._head = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def xy(self):
+        """Returns (x, y) views of the stored samples, oldest first."""
+        start = (self._head - self._size) % self.capacity
+        stop = start + self._size
+        return self._data[0, start:stop], self._data[1, start:stop]
+
+
+def _wrap(angle):
+    """The angle in (-pi, pi]."""
+    return angle - 2 * math.pi * math.ceil((angle - math.pi) / (2 * math.pi))